@@ -1,5 +1,18 @@
+from decimal import Decimal
+from functools import lru_cache
+
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
 from django.contrib.auth.admin import UserAdmin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Count, Func, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Length, Substr
+from django.forms.models import BaseInlineFormSet
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.functional import cached_property
+from django.utils.html import format_html, format_html_join
 from django.utils.safestring import mark_safe
 from .models import (
     User, PasswordResetToken, Category, SiteSettings, Book, Course, Webinar, Service,
@@ -7,6 +20,46 @@ from .models import (
     ServiceChat, ServiceChatMessage, ContactMessage
 )
 
+# Fieldsets shared by several admins below
+_TIMESTAMPS_FIELDSET = ('Timestamps', {
+    'fields': ('created_at', 'updated_at'),
+    'classes': ('collapse',)
+})
+_PRODUCT_BASIC_FIELDSET = ('Basic Information', {
+    'fields': ('title', 'description', 'price', 'category', 'seller', 'is_active')
+})
+
+
+class JsonbArrayLength(Func):
+    """Postgres jsonb_array_length() for JSONField lists"""
+    function = 'jsonb_array_length'
+    output_field = IntegerField()
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator for large, append-only tables.
+    Uses the Postgres planner estimate instead of COUNT(*) when the
+    changelist is unfiltered; filtered querysets are counted exactly.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor == 'postgresql' and not queryset.query.where:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+                    [queryset.model._meta.db_table]
+                )
+                row = cursor.fetchone()
+            # reltuples is -1 (or 0) until the table has been analyzed
+            if row and row[0] > 0:
+                return row[0]
+        return super().count
+
+
 @admin.register(User)
 class CustomUserAdmin(UserAdmin):
     list_display = ('username', 'email', 'full_name', 'phone_number', 'user_type', 'has_profile_image', 'is_staff', 'date_joined')
@@ -14,6 +67,7 @@ class CustomUserAdmin(UserAdmin):
     search_fields = ('username', 'email', 'full_name', 'phone_number')
     ordering = ('-date_joined',)
     readonly_fields = ('profile_image_preview',)
+    _IMG_TMPL = '<img src="{}" style="max-width: 100px; max-height: 100px; border-radius: 50%; object-fit: cover;" />'
 
     fieldsets = UserAdmin.fieldsets + (
         ('Additional Info', {'fields': ('full_name', 'phone_number', 'user_type')}),
@@ -28,16 +82,17 @@ class CustomUserAdmin(UserAdmin):
 
     def profile_image_preview(self, obj):
         """Show profile image preview in admin"""
-        if obj.profile_image:
-            return mark_safe(f'<img src="{obj.profile_image.url}" style="max-width: 100px; max-height: 100px; border-radius: 50%; object-fit: cover;" />')
+        if obj.profile_image_url:
+            return format_html(self._IMG_TMPL, obj.profile_image_url)
         return "No image uploaded"
     profile_image_preview.short_description = 'Profile Image Preview'
 
 @admin.register(PasswordResetToken)
 class PasswordResetTokenAdmin(admin.ModelAdmin):
     list_display = ('user', 'token', 'created_at', 'is_used', 'is_expired')
+    list_select_related = ('user',)
     list_filter = ('is_used', 'created_at')
-    search_fields = ('user__email', 'user__username', 'token')
+    search_fields = ('user__email', 'user__username', '=token')
     ordering = ('-created_at',)
     readonly_fields = ('token', 'created_at')
     
@@ -69,12 +124,16 @@ class CategoryAdmin(admin.ModelAdmin):
             'classes': ('collapse',),
             'description': 'List of subcategories under this category'
         }),
-        ('Timestamps', {
-            'fields': ('created_at', 'updated_at'),
-            'classes': ('collapse',)
-        }),
+        _TIMESTAMPS_FIELDSET,
     )
 
+    def get_queryset(self, request):
+        """Eager-load parent category and creator, and count subcategories"""
+        qs = super().get_queryset(request)
+        return qs.select_related('parent', 'created_by').annotate(
+            _subcat_count=Count('subcategories')
+        )
+
     def get_category_type(self, obj):
         """Display category type"""
         return "Main Category" if obj.is_main_category else "Sub-Category"
@@ -83,22 +142,27 @@ class CategoryAdmin(admin.ModelAdmin):
     def get_subcategory_count(self, obj):
         """Display count of subcategories"""
         if obj.is_main_category:
-            count = obj.subcategories.count()
-            return f"{count} sub-categories"
+            return f"{obj._subcat_count} sub-categories"
         return "-"
     get_subcategory_count.short_description = 'Subcategories'
+    get_subcategory_count.admin_order_field = '_subcat_count'
 
     def subcategory_list(self, obj):
         """Display list of subcategories"""
         if obj.is_main_category:
-            subs = obj.subcategories.all()
+            subs = obj.subcategories.only('name', 'is_approved', 'approval_status')
             if subs:
-                html = '<ul style="margin-left: 20px;">'
-                for sub in subs:
-                    status_color = 'green' if sub.is_approved else 'orange'
-                    html += f'<li><strong>{sub.name}</strong> <span style="color: {status_color};">({sub.approval_status})</span></li>'
-                html += '</ul>'
-                return mark_safe(html)
+                return format_html(
+                    '<ul style="margin-left: 20px;">{}</ul>',
+                    format_html_join(
+                        '',
+                        '<li><strong>{}</strong> <span style="color: {};">({})</span></li>',
+                        (
+                            (sub.name, 'green' if sub.is_approved else 'orange', sub.approval_status)
+                            for sub in subs
+                        ),
+                    ),
+                )
             return "No subcategories yet"
         return "Not applicable (this is a sub-category)"
     subcategory_list.short_description = 'Subcategories List'
@@ -107,18 +171,42 @@ class CategoryAdmin(admin.ModelAdmin):
         """Auto-generate slug if not provided"""
         if not obj.slug:
             from django.utils.text import slugify
-            base_slug = slugify(obj.name)
-            slug = base_slug
-            counter = 1
+            obj.slug = Category.generate_unique_slug(slugify(obj.name), exclude_pk=obj.pk)
+
+        super().save_model(request, obj, form, change)
 
-            # Ensure uniqueness
-            while Category.objects.filter(slug=slug).exclude(pk=obj.pk).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
 
-            obj.slug = slug
+_COMMISSION_EXAMPLES = (
+    ('$10.00', Decimal('10')),
+    ('$50.00', Decimal('50')),
+    ('$100.00', Decimal('100')),
+    ('$500.00', Decimal('500')),
+)
 
-        super().save_model(request, obj, form, change)
+
+@lru_cache(maxsize=64)
+def _render_commission_preview(commission_percentage):
+    """Render the commission examples table; output depends only on the rate"""
+    site_settings = SiteSettings(commission_enabled=True, commission_percentage=commission_percentage)
+    rows = []
+    for price_str, price in _COMMISSION_EXAMPLES:
+        commission = site_settings.get_commission_amount(price)
+        rows.append((price_str, commission, price - commission))
+
+    return format_html(
+        '<table style="border-collapse: collapse; margin-top: 10px;">'
+        '<tr style="background-color: #f8f9fa;"><th style="padding: 8px; border: 1px solid #dee2e6;">Sale Price</th><th style="padding: 8px; border: 1px solid #dee2e6;">Platform Gets</th><th style="padding: 8px; border: 1px solid #dee2e6;">Seller Gets</th></tr>'
+        '{}</table>'
+        '<p style="margin-top: 10px; color: #6c757d;"><small>Current commission rate: <strong>{}%</strong></small></p>',
+        format_html_join(
+            '',
+            '<tr><td style="padding: 8px; border: 1px solid #dee2e6; text-align: center;">{}</td>'
+            '<td style="padding: 8px; border: 1px solid #dee2e6; text-align: center; color: #28a745; font-weight: bold;">${}</td>'
+            '<td style="padding: 8px; border: 1px solid #dee2e6; text-align: center;">${}</td></tr>',
+            rows,
+        ),
+        commission_percentage,
+    )
 
 
 @admin.register(SiteSettings)
@@ -143,10 +231,7 @@ class SiteSettingsAdmin(admin.ModelAdmin):
             'fields': ('platform_stripe_account_id',),
             'description': 'Platform owner\'s Stripe Account ID for receiving commissions. Get this from your Stripe Dashboard.'
         }),
-        ('Timestamps', {
-            'fields': ('created_at', 'updated_at'),
-            'classes': ('collapse',)
-        }),
+        _TIMESTAMPS_FIELDSET,
     )
 
     def has_platform_account(self, obj):
@@ -159,34 +244,12 @@ class SiteSettingsAdmin(admin.ModelAdmin):
         """Show commission calculation examples"""
         if not obj.commission_enabled:
             return mark_safe('<p style="color: #dc3545;">Commission is currently <strong>DISABLED</strong></p>')
-
-        examples = [
-            ('$10.00', 10),
-            ('$50.00', 50),
-            ('$100.00', 100),
-            ('$500.00', 500),
-        ]
-
-        html = '<table style="border-collapse: collapse; margin-top: 10px;">'
-        html += '<tr style="background-color: #f8f9fa;"><th style="padding: 8px; border: 1px solid #dee2e6;">Sale Price</th><th style="padding: 8px; border: 1px solid #dee2e6;">Platform Gets</th><th style="padding: 8px; border: 1px solid #dee2e6;">Seller Gets</th></tr>'
-
-        for price_str, price_val in examples:
-            from decimal import Decimal
-            price = Decimal(str(price_val))
-            commission = obj.get_commission_amount(price)
-            seller_amount = obj.get_seller_amount(price)
-            html += f'<tr><td style="padding: 8px; border: 1px solid #dee2e6; text-align: center;">{price_str}</td>'
-            html += f'<td style="padding: 8px; border: 1px solid #dee2e6; text-align: center; color: #28a745; font-weight: bold;">${commission}</td>'
-            html += f'<td style="padding: 8px; border: 1px solid #dee2e6; text-align: center;">${seller_amount}</td></tr>'
-
-        html += '</table>'
-        html += f'<p style="margin-top: 10px; color: #6c757d;"><small>Current commission rate: <strong>{obj.commission_percentage}%</strong></small></p>'
-        return mark_safe(html)
+        return _render_commission_preview(obj.commission_percentage)
     commission_preview.short_description = 'Commission Examples'
 
     def has_add_permission(self, request):
         """Prevent adding more than one instance"""
-        if SiteSettings.objects.exists():
+        if SiteSettings.instance_exists():
             return False
         return super().has_add_permission(request)
 
@@ -195,130 +258,107 @@ class SiteSettingsAdmin(admin.ModelAdmin):
         return False
 
 
-@admin.register(Book)
-class BookAdmin(admin.ModelAdmin):
-    list_display = ('title', 'seller', 'category', 'price', 'is_active', 'created_at')
-    list_filter = ('category', 'is_active', 'created_at', 'seller__user_type')
-    search_fields = ('title', 'description', 'seller__username', 'seller__full_name')
-    ordering = ('-created_at',)
-    readonly_fields = ('created_at', 'updated_at', 'book_image_preview')
+class ProjectedChangeList(ChangeList):
+    """Changelist that narrows the SELECT to the columns the list renders"""
 
-    fieldsets = (
-        ('Basic Information', {
-            'fields': ('title', 'description', 'price', 'category', 'seller', 'is_active')
-        }),
-        ('Files', {
-            'fields': ('book_image', 'book_image_preview', 'book_file')
-        }),
-        ('Timestamps', {
-            'fields': ('created_at', 'updated_at'),
-            'classes': ('collapse',)
-        }),
-    )
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        if self.model_admin.changelist_only_fields:
+            qs = qs.only(*self.model_admin.changelist_only_fields)
+        if self.model_admin.changelist_defer_fields:
+            qs = qs.defer(*self.model_admin.changelist_defer_fields)
+        return qs
 
-    def book_image_preview(self, obj):
-        """Show book image preview in admin"""
-        if obj.book_image:
-            return mark_safe(f'<img src="{obj.book_image.url}" style="max-width: 200px; max-height: 200px; object-fit: cover;" />')
-        return "No image uploaded"
-    book_image_preview.short_description = 'Book Image Preview'
 
+class ChangeListProjectionMixin:
+    """
+    Apply only()/defer() to the changelist queryset alone.
+    ModelAdmin.get_queryset also backs the change form, which needs every column.
+    """
+    changelist_only_fields = ()
+    changelist_defer_fields = ()
+
+    def get_changelist(self, request, **kwargs):
+        return ProjectedChangeList
 
-@admin.register(Course)
-class CourseAdmin(admin.ModelAdmin):
+
+class ProductAdminBase(ChangeListProjectionMixin, admin.ModelAdmin):
+    """Shared changelist and change form configuration for product admins"""
     list_display = ('title', 'seller', 'category', 'price', 'is_active', 'created_at')
+    list_select_related = ('seller', 'category__parent')
+    # Columns needed by list_display, including User.__str__ and Category.__str__
+    changelist_only_fields = (
+        'id', 'title', 'price', 'is_active', 'created_at',
+        'seller__id', 'seller__username', 'seller__user_type',
+        'category__id', 'category__name', 'category__parent__id', 'category__parent__name',
+    )
     list_filter = ('category', 'is_active', 'created_at', 'seller__user_type')
-    search_fields = ('title', 'description', 'seller__username', 'seller__full_name')
+    search_fields = ('title', 'description', '=seller__username', 'seller__full_name')
     ordering = ('-created_at',)
-    readonly_fields = ('created_at', 'updated_at', 'course_image_preview')
-
-    fieldsets = (
-        ('Basic Information', {
-            'fields': ('title', 'description', 'price', 'category', 'seller', 'is_active')
-        }),
-        ('Files', {
-            'fields': ('course_image', 'course_image_preview', 'course_file')
-        }),
-        ('Timestamps', {
-            'fields': ('created_at', 'updated_at'),
-            'classes': ('collapse',)
-        }),
-    )
+    readonly_fields = ('created_at', 'updated_at', 'image_preview')
+    autocomplete_fields = ('seller', 'category')
+    _IMG_TMPL = '<img src="{}" style="max-width: 200px; max-height: 200px; object-fit: cover;" />'
+
+    # Set by each concrete admin; fieldsets are generated from them
+    image_field = None
+    file_field = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        media_fields = tuple(f for f in (cls.image_field, 'image_preview', cls.file_field) if f)
+        cls.fieldsets = (
+            _PRODUCT_BASIC_FIELDSET,
+            ('Files' if cls.file_field else 'Image', {'fields': media_fields}),
+            _TIMESTAMPS_FIELDSET,
+        )
 
-    def course_image_preview(self, obj):
-        """Show course image preview in admin"""
-        if obj.course_image:
-            return mark_safe(f'<img src="{obj.course_image.url}" style="max-width: 200px; max-height: 200px; object-fit: cover;" />')
+    def image_preview(self, obj):
+        """Show product image preview in admin"""
+        if obj.image_url:
+            return format_html(self._IMG_TMPL, obj.image_url)
         return "No image uploaded"
-    course_image_preview.short_description = 'Course Image Preview'
+    image_preview.short_description = 'Image Preview'
 
 
-@admin.register(Webinar)
-class WebinarAdmin(admin.ModelAdmin):
-    list_display = ('title', 'seller', 'category', 'price', 'is_active', 'created_at')
-    list_filter = ('category', 'is_active', 'created_at', 'seller__user_type')
-    search_fields = ('title', 'description', 'seller__username', 'seller__full_name')
-    ordering = ('-created_at',)
-    readonly_fields = ('created_at', 'updated_at', 'webinar_image_preview')
+@admin.register(Book)
+class BookAdmin(ProductAdminBase):
+    image_field = 'book_image'
+    file_field = 'book_file'
 
-    fieldsets = (
-        ('Basic Information', {
-            'fields': ('title', 'description', 'price', 'category', 'seller', 'is_active')
-        }),
-        ('Files', {
-            'fields': ('webinar_image', 'webinar_image_preview', 'webinar_file')
-        }),
-        ('Timestamps', {
-            'fields': ('created_at', 'updated_at'),
-            'classes': ('collapse',)
-        }),
-    )
 
-    def webinar_image_preview(self, obj):
-        """Show webinar image preview in admin"""
-        if obj.webinar_image:
-            return mark_safe(f'<img src="{obj.webinar_image.url}" style="max-width: 200px; max-height: 200px; object-fit: cover;" />')
-        return "No image uploaded"
-    webinar_image_preview.short_description = 'Webinar Image Preview'
+@admin.register(Course)
+class CourseAdmin(ProductAdminBase):
+    image_field = 'course_image'
+    file_field = 'course_file'
 
 
-@admin.register(Service)
-class ServiceAdmin(admin.ModelAdmin):
-    list_display = ('title', 'seller', 'category', 'price', 'is_active', 'created_at')
-    list_filter = ('category', 'is_active', 'created_at', 'seller__user_type')
-    search_fields = ('title', 'description', 'seller__username', 'seller__full_name')
-    ordering = ('-created_at',)
-    readonly_fields = ('created_at', 'updated_at', 'service_image_preview')
+@admin.register(Webinar)
+class WebinarAdmin(ProductAdminBase):
+    image_field = 'webinar_image'
+    file_field = 'webinar_file'
 
-    fieldsets = (
-        ('Basic Information', {
-            'fields': ('title', 'description', 'price', 'category', 'seller', 'is_active')
-        }),
-        ('Image', {
-            'fields': ('service_image', 'service_image_preview')
-        }),
-        ('Timestamps', {
-            'fields': ('created_at', 'updated_at'),
-            'classes': ('collapse',)
-        }),
-    )
 
-    def service_image_preview(self, obj):
-        """Show service image preview in admin"""
-        if obj.service_image:
-            return mark_safe(f'<img src="{obj.service_image.url}" style="max-width: 200px; max-height: 200px; object-fit: cover;" />')
-        return "No image uploaded"
-    service_image_preview.short_description = 'Service Image Preview'
+@admin.register(Service)
+class ServiceAdmin(ProductAdminBase):
+    image_field = 'service_image'
 
 
 @admin.register(UserBrowsingHistory)
 class UserBrowsingHistoryAdmin(admin.ModelAdmin):
     list_display = ('user', 'get_product_title', 'content_type', 'viewed_at')
+    list_select_related = ('user', 'content_type')
     list_filter = ('content_type', 'viewed_at')
-    search_fields = ('user__username', 'user__full_name')
+    search_fields = ('=user__username', 'user__full_name')
     ordering = ('-viewed_at',)
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+    list_per_page = 50
     readonly_fields = ('user', 'content_type', 'object_id', 'viewed_at')
 
+    def get_queryset(self, request):
+        """Prefetch viewed products with one query per content type"""
+        return super().get_queryset(request).prefetch_related('product')
+
     def get_product_title(self, obj):
         """Get the title of the viewed product"""
         if obj.product:
@@ -331,10 +371,17 @@ class UserBrowsingHistoryAdmin(admin.ModelAdmin):
 class UserSearchHistoryAdmin(admin.ModelAdmin):
     list_display = ('get_user', 'query', 'results_count', 'searched_at')
     list_filter = ('searched_at',)
-    search_fields = ('user__username', 'user__full_name', 'query')
+    search_fields = ('=user__username', 'user__full_name', 'query')
     ordering = ('-searched_at',)
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+    list_per_page = 50
     readonly_fields = ('user', 'query', 'results_count', 'searched_at')
 
+    def get_queryset(self, request):
+        """Eager-load the searching user"""
+        return super().get_queryset(request).select_related('user')
+
     def get_user(self, obj):
         """Get username or Anonymous"""
         return obj.user.username if obj.user else "Anonymous"
@@ -342,64 +389,123 @@ class UserSearchHistoryAdmin(admin.ModelAdmin):
 
 
 @admin.register(UserPreference)
-class UserPreferenceAdmin(admin.ModelAdmin):
+class UserPreferenceAdmin(ChangeListProjectionMixin, admin.ModelAdmin):
     list_display = ('user', 'get_categories_count', 'get_keywords_count', 'last_updated')
+    list_select_related = ('user',)
     list_filter = ('last_updated',)
-    search_fields = ('user__username', 'user__full_name')
+    search_fields = ('=user__username', 'user__full_name')
     ordering = ('-last_updated',)
     readonly_fields = ('user', 'favorite_categories', 'interests_keywords', 'last_updated')
+    changelist_defer_fields = ('favorite_categories', 'interests_keywords')
+
+    def get_queryset(self, request):
+        """Count JSON list entries in the database instead of decoding them"""
+        qs = super().get_queryset(request)
+        return qs.annotate(
+            _categories_count=JsonbArrayLength('favorite_categories'),
+            _keywords_count=JsonbArrayLength('interests_keywords'),
+        )
 
     def get_categories_count(self, obj):
         """Get count of favorite categories"""
-        return len(obj.favorite_categories) if obj.favorite_categories else 0
+        return obj._categories_count or 0
     get_categories_count.short_description = 'Favorite Categories'
+    get_categories_count.admin_order_field = '_categories_count'
 
     def get_keywords_count(self, obj):
         """Get count of interest keywords"""
-        return len(obj.interests_keywords) if obj.interests_keywords else 0
+        return obj._keywords_count or 0
     get_keywords_count.short_description = 'Interest Keywords'
+    get_keywords_count.admin_order_field = '_keywords_count'
+
+
+class RecentMessagesFormSet(BaseInlineFormSet):
+    """Inline formset that only loads the latest max_num messages"""
+
+    def get_queryset(self):
+        if not hasattr(self, '_queryset'):
+            # Slice after the parent filter is applied so the LIMIT reaches SQL
+            self._queryset = super().get_queryset()[:self.max_num]
+        return self._queryset
 
 
 class ServiceChatMessageInline(admin.TabularInline):
     """Inline display of chat messages within ServiceChat admin"""
     model = ServiceChatMessage
+    formset = RecentMessagesFormSet
     extra = 0
     readonly_fields = ('sender', 'message', 'is_read', 'created_at')
     can_delete = False
     max_num = 10  # Show only last 10 messages in inline
     ordering = ('-created_at',)
+    show_change_link = True
+
+    def get_queryset(self, request):
+        """Eager-load message senders"""
+        return super().get_queryset(request).select_related('sender')
 
 
 @admin.register(ServiceChat)
 class ServiceChatAdmin(admin.ModelAdmin):
     list_display = ('buyer', 'seller', 'service', 'get_last_message_preview', 'get_unread_messages', 'created_at', 'updated_at')
+    list_select_related = ('buyer', 'seller', 'service')
     list_filter = ('created_at', 'updated_at')
-    search_fields = ('buyer__username', 'buyer__full_name', 'seller__username', 'seller__full_name', 'service__title')
+    search_fields = ('=buyer__username', 'buyer__full_name', '=seller__username', 'seller__full_name', 'service__title')
     ordering = ('-updated_at',)
-    readonly_fields = ('buyer', 'seller', 'service', 'created_at', 'updated_at')
+    readonly_fields = ('buyer', 'seller', 'service', 'created_at', 'updated_at', 'all_messages_link')
     inlines = [ServiceChatMessageInline]
 
+    def get_queryset(self, request):
+        """Eager-load participants and annotate unread count and last message"""
+        qs = super().get_queryset(request)
+        last_message = ServiceChatMessage.objects.filter(chat=OuterRef('pk')).order_by('-created_at')
+        return qs.select_related('buyer', 'seller', 'service').annotate(
+            _unread=Count('messages', filter=Q(messages__is_read=False)),
+            _last_message=Subquery(last_message.values(snippet=Substr('message', 1, 50))[:1]),
+            _last_sender=Subquery(last_message.values('sender__full_name')[:1]),
+        )
+
     def get_last_message_preview(self, obj):
         """Show preview of last message"""
-        last_msg = obj.get_last_message()
-        if last_msg:
-            return f"{last_msg.sender.full_name}: {last_msg.message[:50]}..."
+        if obj._last_message is not None:
+            return f"{obj._last_sender}: {obj._last_message}..."
         return "No messages yet"
     get_last_message_preview.short_description = 'Last Message'
 
     def get_unread_messages(self, obj):
         """Show count of unread messages"""
-        return obj.messages.filter(is_read=False).count()
+        return obj._unread
     get_unread_messages.short_description = 'Unread Messages'
+    get_unread_messages.admin_order_field = '_unread'
+
+    def all_messages_link(self, obj):
+        """Link to the paginated message changelist for this chat"""
+        url = reverse('admin:accounts_servicechatmessage_changelist')
+        return format_html('<a href="{}?chat__id__exact={}">View full conversation</a>', url, obj.pk)
+    all_messages_link.short_description = 'All Messages'
 
 
 @admin.register(ServiceChatMessage)
-class ServiceChatMessageAdmin(admin.ModelAdmin):
+class ServiceChatMessageAdmin(ChangeListProjectionMixin, admin.ModelAdmin):
     list_display = ('get_chat_info', 'sender', 'get_message_preview', 'is_read', 'created_at')
+    list_select_related = ('chat__buyer', 'chat__seller', 'sender')
     list_filter = ('is_read', 'created_at', 'sender__user_type')
-    search_fields = ('chat__buyer__username', 'chat__seller__username', 'sender__username', 'message')
+    search_fields = ('=chat__buyer__username', '=chat__seller__username', '=sender__username', 'message')
     ordering = ('-created_at',)
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+    list_per_page = 50
     readonly_fields = ('chat', 'sender', 'message', 'is_read', 'created_at')
+    # The changelist only shows the SQL-side preview
+    changelist_defer_fields = ('message',)
+
+    def get_queryset(self, request):
+        """Eager-load chat participants and sender, and cut the preview in SQL"""
+        qs = super().get_queryset(request)
+        return qs.select_related('chat__buyer', 'chat__seller', 'sender').annotate(
+            _preview=Substr('message', 1, 100),
+            _length=Length('message'),
+        )
 
     def get_chat_info(self, obj):
         """Show chat participants"""
@@ -408,22 +514,25 @@ class ServiceChatMessageAdmin(admin.ModelAdmin):
 
     def get_message_preview(self, obj):
         """Show message preview"""
-        return obj.message[:100] + "..." if len(obj.message) > 100 else obj.message
+        return obj._preview + "..." if obj._length > 100 else obj._preview
     get_message_preview.short_description = 'Message'
 
 
 @admin.register(ContactMessage)
-class ContactMessageAdmin(admin.ModelAdmin):
+class ContactMessageAdmin(ChangeListProjectionMixin, admin.ModelAdmin):
     """
     Admin interface for managing contact form submissions.
     Displays all submissions with filtering, search, and status management.
     """
     list_display = ('name', 'email', 'subject', 'status', 'email_sent', 'created_at', 'get_user_type')
     list_filter = ('status', 'email_sent', 'created_at', 'user__user_type')
-    search_fields = ('name', 'email', 'subject', 'message', 'ip_address')
+    search_fields = ('name', 'email', 'subject', 'message', '=ip_address')
     ordering = ('-created_at',)
     readonly_fields = ('user', 'ip_address', 'user_agent', 'email_sent', 'created_at', 'read_at', 'replied_at', 'formatted_message')
     actions = ['mark_as_read', 'mark_as_replied', 'mark_as_archived']
+    changelist_defer_fields = ('message', 'user_agent', 'admin_notes')
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
 
     fieldsets = (
         ('Contact Information', {
@@ -452,6 +561,10 @@ class ContactMessageAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        """Eager-load the linked user account"""
+        return super().get_queryset(request).select_related('user')
+
     def get_user_type(self, obj):
         """Display user type if message is from a logged-in user"""
         if obj.user:
@@ -461,19 +574,12 @@ class ContactMessageAdmin(admin.ModelAdmin):
 
     def formatted_message(self, obj):
         """Display message with proper formatting"""
-        return mark_safe(f'<div style="white-space: pre-wrap; padding: 10px; background-color: #f8f9fa; border-radius: 5px; border-left: 4px solid #007bff;">{obj.message}</div>')
+        return format_html('<div style="white-space: pre-wrap; padding: 10px; background-color: #f8f9fa; border-radius: 5px; border-left: 4px solid #007bff;">{}</div>', obj.message)
     formatted_message.short_description = 'Message Content'
 
     def mark_as_read(self, request, queryset):
         """Mark selected messages as read"""
-        from django.utils import timezone
-        updated = 0
-        for message in queryset:
-            if message.status == 'new':
-                message.status = 'read'
-                message.read_at = timezone.now()
-                message.save(update_fields=['status', 'read_at'])
-                updated += 1
+        updated = queryset.filter(status='new').update(status='read', read_at=timezone.now())
 
         self.message_user(
             request,
@@ -484,14 +590,9 @@ class ContactMessageAdmin(admin.ModelAdmin):
 
     def mark_as_replied(self, request, queryset):
         """Mark selected messages as replied"""
-        from django.utils import timezone
-        updated = 0
-        for message in queryset:
-            if message.status in ['new', 'read']:
-                message.status = 'replied'
-                message.replied_at = timezone.now()
-                message.save(update_fields=['status', 'replied_at'])
-                updated += 1
+        updated = queryset.filter(status__in=['new', 'read']).update(
+            status='replied', replied_at=timezone.now()
+        )
 
         self.message_user(
             request,
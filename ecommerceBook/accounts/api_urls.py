@@ -1,6 +1,7 @@
 """
 API URL configuration for REST API endpoints.
 """
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from rest_framework_simplejwt.views import TokenRefreshView
@@ -45,26 +46,35 @@ schema_view = get_schema_view(
     permission_classes=[permissions.AllowAny],
 )
 
-# Create router and register viewsets
+# Schema generation walks every viewset and serializer; cache it outside development
+SCHEMA_CACHE_TIMEOUT = 0 if settings.DEBUG else 60 * 60
+SCHEMA_CACHE_KWARGS = {'key_prefix': 'api_schema'}
+
+# Router registrations: (prefix, viewset, basename)
+VIEWSETS = (
+    (r'users', UserViewSet, 'user'),
+    (r'categories', CategoryViewSet, 'category'),
+    (r'books', BookViewSet, 'book'),
+    (r'courses', CourseViewSet, 'course'),
+    (r'webinars', WebinarViewSet, 'webinar'),
+    (r'cart', CartViewSet, 'cart'),
+    (r'orders', OrderViewSet, 'order'),
+    (r'ratings', RatingViewSet, 'rating'),
+    (r'notifications', NotificationViewSet, 'notification'),
+    (r'chat-sessions', ChatSessionViewSet, 'chat-session'),
+    (r'preferences', UserPreferenceViewSet, 'preference'),
+)
+
 router = DefaultRouter()
-router.register(r'users', UserViewSet, basename='user')
-router.register(r'categories', CategoryViewSet, basename='category')
-router.register(r'books', BookViewSet, basename='book')
-router.register(r'courses', CourseViewSet, basename='course')
-router.register(r'webinars', WebinarViewSet, basename='webinar')
-router.register(r'cart', CartViewSet, basename='cart')
-router.register(r'orders', OrderViewSet, basename='order')
-router.register(r'ratings', RatingViewSet, basename='rating')
-router.register(r'notifications', NotificationViewSet, basename='notification')
-router.register(r'chat-sessions', ChatSessionViewSet, basename='chat-session')
-router.register(r'preferences', UserPreferenceViewSet, basename='preference')
+for prefix, viewset, basename in VIEWSETS:
+    router.register(prefix, viewset, basename=basename)
 
 # URL patterns
 urlpatterns = [
     # API Documentation
-    path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-    path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
-    path('swagger.json', schema_view.without_ui(cache_timeout=0), name='schema-json'),
+    path('swagger/', schema_view.with_ui('swagger', cache_timeout=SCHEMA_CACHE_TIMEOUT, cache_kwargs=SCHEMA_CACHE_KWARGS), name='schema-swagger-ui'),
+    path('redoc/', schema_view.with_ui('redoc', cache_timeout=SCHEMA_CACHE_TIMEOUT, cache_kwargs=SCHEMA_CACHE_KWARGS), name='schema-redoc'),
+    path('swagger.json', schema_view.without_ui(cache_timeout=SCHEMA_CACHE_TIMEOUT, cache_kwargs=SCHEMA_CACHE_KWARGS), name='schema-json'),
 
     # JWT Authentication
     path('auth/', include([
@@ -8,9 +8,13 @@ from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
 from django_filters.rest_framework import DjangoFilterBackend
 from django.contrib.contenttypes.models import ContentType
-from django.db.models import Q
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, F, Q, prefetch_related_objects
+from django.db.models.functions import Least
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from django.core.cache import cache
+import hashlib
 import logging
 
 from .models import (
@@ -25,12 +29,82 @@ from .serializers import (
     WebinarSerializer, WebinarListSerializer, CartSerializer,
     CartItemSerializer, OrderSerializer, OrderListSerializer,
     RatingSerializer, NotificationSerializer, ChatSessionSerializer,
-    ChatMessageSerializer, UserPreferenceSerializer
+    ChatMessageSerializer, UserPreferenceSerializer,
+    ORDER_LIST_VALUES, cart_to_dict, order_row_to_dict
 )
-from .permissions import IsOwnerOrReadOnly, IsSellerOrReadOnly, IsBuyerUser
+from .permissions import (
+    IsOwnerOrReadOnly, IsSellerOrReadOnly, IsBuyerUser, is_seller_request
+)
+from .tasks import answer_chat_message_task
 
 logger = logging.getLogger(__name__)
 
+# Product type names accepted by the API
+PRODUCT_MODELS = {
+    'book': Book,
+    'course': Course,
+    'webinar': Webinar,
+}
+
+# Upper bound of CartItem.quantity (its MaxValueValidator)
+MAX_CART_ITEM_QUANTITY = 100
+
+# Downloadable file field per product ContentType.model
+PRODUCT_FILE_FIELDS = {
+    'book': 'book_file',
+    'course': 'course_file',
+    'webinar': 'webinar_file',
+}
+
+
+def _product_content_type(product_type):
+    """
+    Resolve an API product type name to its ContentType.
+    Raises KeyError for unknown names; get_for_model() is served from
+    ContentType's own per-process cache after the first lookup.
+    """
+    return ContentType.objects.get_for_model(PRODUCT_MODELS[product_type])
+
+
+# Columns read by every product list serializer
+PRODUCT_LIST_FIELDS = ('id', 'title', 'description', 'price', 'is_active', 'category__name')
+
+
+def _project_product_list(queryset, *fields):
+    """Narrow a product queryset to the columns its list serializer reads"""
+    return queryset.select_related(None).select_related('category').only(
+        *PRODUCT_LIST_FIELDS, *fields
+    )
+
+
+class CachedListMixin:
+    """
+    Cache list response data per absolute request URI (scheme, host and query),
+    since paginated responses embed absolute next/previous links.
+    Entries are keyed by a version token that the model drops on save/delete
+    (see ListCacheVersionMixin), so writes orphan all cached pages at once.
+    Authenticated requests bypass the cache unless cache_authenticated_lists
+    is set, since their results can depend on the user.
+    """
+    list_cache_timeout = 300
+    cache_authenticated_lists = False
+
+    def list(self, request, *args, **kwargs):
+        if request.user.is_authenticated and not self.cache_authenticated_lists:
+            return super().list(request, *args, **kwargs)
+
+        model = self.get_queryset().model
+        version = model.list_cache_token()
+        path_digest = hashlib.sha256(request.build_absolute_uri().encode('utf-8')).hexdigest()
+        cache_key = f'api_list_{model._meta.model_name}_{version}_{path_digest}'
+
+        data = cache.get(cache_key)
+        if data is None:
+            response = super().list(request, *args, **kwargs)
+            cache.set(cache_key, response.data, self.list_cache_timeout)
+            return response
+        return Response(data)
+
 
 # ==============================================================================
 # CUSTOM PERMISSIONS
@@ -47,7 +121,7 @@ class IsSeller(permissions.BasePermission):
     """Allow access only to sellers"""
 
     def has_permission(self, request, view):
-        return request.user.is_authenticated and request.user.user_type == 'seller'
+        return is_seller_request(request)
 
 
 # ==============================================================================
@@ -140,6 +214,30 @@ class UserViewSet(viewsets.ModelViewSet):
             return User.objects.all()
         return User.objects.filter(id=self.request.user.id)
 
+    def list(self, request, *args, **kwargs):
+        """Non-staff users only ever list themselves; serve request.user directly"""
+        if request.user.is_staff or request.query_params.get(filters.SearchFilter.search_param):
+            return super().list(request, *args, **kwargs)
+
+        page = self.paginate_queryset([request.user])
+        serializer = self.get_serializer(page if page is not None else [request.user], many=True)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
+
+    def retrieve(self, request, *args, **kwargs):
+        """Non-staff users can only retrieve themselves; skip the lookup query"""
+        if request.user.is_staff:
+            return super().retrieve(request, *args, **kwargs)
+
+        if str(kwargs.get(self.lookup_url_kwarg or self.lookup_field)) != str(request.user.pk):
+            return Response(
+                {'detail': 'Not found.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        serializer = self.get_serializer(request.user)
+        return Response(serializer.data)
+
     @action(detail=False, methods=['get'], url_path='me')
     def me(self, request):
         """Get current user profile"""
@@ -151,9 +249,11 @@ class UserViewSet(viewsets.ModelViewSet):
 # PRODUCT VIEWSETS
 # ==============================================================================
 
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(CachedListMixin, viewsets.ModelViewSet):
     """ViewSet for Category model"""
     queryset = Category.objects.filter(is_active=True)
+    # Category listings are the same for every user
+    cache_authenticated_lists = True
     serializer_class = CategorySerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
@@ -167,9 +267,9 @@ class CategoryViewSet(viewsets.ModelViewSet):
         return [permissions.AllowAny()]
 
 
-class BookViewSet(viewsets.ModelViewSet):
+class BookViewSet(CachedListMixin, viewsets.ModelViewSet):
     """ViewSet for Book model"""
-    queryset = Book.objects.filter(is_active=True, is_deleted=False)
+    queryset = Book.objects.filter(is_active=True, is_deleted=False).select_related('seller', 'category')
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['category', 'seller', 'price']
@@ -188,6 +288,8 @@ class BookViewSet(viewsets.ModelViewSet):
         if self.request.user.is_authenticated and self.request.user.user_type == 'seller':
             if self.request.query_params.get('my_products'):
                 queryset = queryset.filter(seller=self.request.user)
+        if self.action == 'list':
+            queryset = _project_product_list(queryset, 'book_image')
         return queryset
 
     def perform_create(self, serializer):
@@ -205,7 +307,7 @@ class BookViewSet(viewsets.ModelViewSet):
 
 class CourseViewSet(viewsets.ModelViewSet):
     """ViewSet for Course model"""
-    queryset = Course.objects.filter(is_active=True, is_deleted=False)
+    queryset = Course.objects.filter(is_active=True, is_deleted=False).select_related('seller', 'category')
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['category', 'seller', 'price']
@@ -222,6 +324,8 @@ class CourseViewSet(viewsets.ModelViewSet):
         if self.request.user.is_authenticated and self.request.user.user_type == 'seller':
             if self.request.query_params.get('my_products'):
                 queryset = queryset.filter(seller=self.request.user)
+        if self.action == 'list':
+            queryset = _project_product_list(queryset, 'course_image', 'duration_hours')
         return queryset
 
     def perform_create(self, serializer):
@@ -237,7 +341,7 @@ class CourseViewSet(viewsets.ModelViewSet):
 
 class WebinarViewSet(viewsets.ModelViewSet):
     """ViewSet for Webinar model"""
-    queryset = Webinar.objects.filter(is_active=True, is_deleted=False)
+    queryset = Webinar.objects.filter(is_active=True, is_deleted=False).select_related('seller', 'category')
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['category', 'seller', 'price']
@@ -254,6 +358,8 @@ class WebinarViewSet(viewsets.ModelViewSet):
         if self.request.user.is_authenticated and self.request.user.user_type == 'seller':
             if self.request.query_params.get('my_products'):
                 queryset = queryset.filter(seller=self.request.user)
+        if self.action == 'list':
+            queryset = _project_product_list(queryset, 'webinar_image', 'scheduled_date')
         return queryset
 
     def perform_create(self, serializer):
@@ -275,56 +381,70 @@ class CartViewSet(viewsets.ModelViewSet):
     """ViewSet for Cart model"""
     serializer_class = CartSerializer
     permission_classes = [permissions.IsAuthenticated, IsBuyerUser]
+    # CartItemSerializer reads each item's product through its GFK; prefetching
+    # resolves them with one query per content type instead of one per item
+    items_prefetch = 'items__content_object'
 
     def get_queryset(self):
         """Users can only see their own cart"""
-        return Cart.objects.filter(user=self.request.user)
+        return Cart.objects.filter(user=self.request.user).prefetch_related(self.items_prefetch)
 
     @action(detail=False, methods=['get'], url_path='my-cart')
     def my_cart(self, request):
         """Get current user's cart"""
         cart, created = Cart.objects.get_or_create(user=request.user)
-        serializer = self.get_serializer(cart)
-        return Response(serializer.data)
+        prefetch_related_objects([cart], self.items_prefetch)
+        return Response(cart_to_dict(cart))
 
     @action(detail=False, methods=['post'], url_path='add-item')
     def add_item(self, request):
         """Add item to cart"""
-        cart, created = Cart.objects.get_or_create(user=request.user)
-
         product_type = request.data.get('product_type')
         product_id = request.data.get('product_id')
-        quantity = request.data.get('quantity', 1)
-
-        # Get content type
-        model_map = {
-            'book': Book,
-            'course': Course,
-            'webinar': Webinar
-        }
 
-        if product_type not in model_map:
+        try:
+            content_type = _product_content_type(product_type)
+        except KeyError:
             return Response(
                 {'error': 'Invalid product type'},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        content_type = ContentType.objects.get_for_model(model_map[product_type])
+        try:
+            quantity = int(request.data.get('quantity', 1))
+        except (TypeError, ValueError):
+            quantity = 0
+        if not 1 <= quantity <= MAX_CART_ITEM_QUANTITY:
+            return Response(
+                {'error': f'Quantity must be between 1 and {MAX_CART_ITEM_QUANTITY}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        cart, created = Cart.objects.get_or_create(user=request.user)
 
-        # Add or update cart item
-        cart_item, created = CartItem.objects.get_or_create(
+        # Increment an existing line in a single UPDATE, otherwise insert it
+        existing = CartItem.objects.filter(
             cart=cart,
             content_type=content_type,
-            object_id=product_id,
-            defaults={'quantity': quantity}
+            object_id=product_id
         )
-
-        if not created:
-            cart_item.quantity += int(quantity)
-            cart_item.save()
-
-        serializer = CartSerializer(cart)
-        return Response(serializer.data)
+        increment = {'quantity': Least(F('quantity') + quantity, MAX_CART_ITEM_QUANTITY)}
+        if not existing.update(**increment):
+            try:
+                with transaction.atomic():
+                    CartItem.objects.create(
+                        cart=cart,
+                        content_type=content_type,
+                        object_id=product_id,
+                        quantity=quantity
+                    )
+            except IntegrityError:
+                # A concurrent request inserted the same line first
+                if not existing.update(**increment):
+                    raise
+
+        prefetch_related_objects([cart], self.items_prefetch)
+        return Response(cart_to_dict(cart))
 
     @action(detail=False, methods=['post'], url_path='remove-item')
     def remove_item(self, request):
@@ -335,8 +455,8 @@ class CartViewSet(viewsets.ModelViewSet):
             cart_item = CartItem.objects.get(id=item_id, cart=cart)
             cart_item.delete()
 
-            serializer = CartSerializer(cart)
-            return Response(serializer.data)
+            prefetch_related_objects([cart], self.items_prefetch)
+            return Response(cart_to_dict(cart))
         except (Cart.DoesNotExist, CartItem.DoesNotExist):
             return Response(
                 {'error': 'Item not found'},
@@ -346,10 +466,10 @@ class CartViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['post'], url_path='clear')
     def clear_cart(self, request):
         """Clear all items from cart"""
-        cart = get_object_or_404(Cart, user=request.user)
+        # Cart.clear() logs the username, so load the user in the same query
+        cart = get_object_or_404(Cart.objects.select_related('user'), user=request.user)
         cart.clear()
-        serializer = CartSerializer(cart)
-        return Response(serializer.data)
+        return Response(cart_to_dict(cart, items=[]))
 
 
 class OrderViewSet(viewsets.ReadOnlyModelViewSet):
@@ -366,7 +486,25 @@ class OrderViewSet(viewsets.ReadOnlyModelViewSet):
 
     def get_queryset(self):
         """Users can only see their own orders"""
-        return Order.objects.filter(user=self.request.user)
+        queryset = Order.objects.filter(user=self.request.user)
+        if self.action == 'retrieve':
+            # OrderItemSerializer reads each item's product through its GFK
+            queryset = queryset.prefetch_related('items__content_object')
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        """List orders from a values() query instead of OrderListSerializer"""
+        queryset = self.filter_queryset(self.get_queryset())
+        queryset = queryset.values(*ORDER_LIST_VALUES).annotate(items_count=Count('items'))
+        if not queryset.ordered:
+            # Meta.ordering is not applied to GROUP BY queries
+            queryset = queryset.order_by(*Order._meta.ordering)
+
+        page = self.paginate_queryset(queryset)
+        rows = [order_row_to_dict(row) for row in (queryset if page is None else page)]
+        if page is not None:
+            return self.get_paginated_response(rows)
+        return Response(rows)
 
     @action(detail=True, methods=['get'], url_path='download/(?P<item_id>[^/.]+)')
     def download_item(self, request, pk=None, item_id=None):
@@ -374,16 +512,13 @@ class OrderViewSet(viewsets.ReadOnlyModelViewSet):
         order = self.get_object()
         order_item = get_object_or_404(OrderItem, id=item_id, order=order)
 
-        # Return file URL
-        product = order_item.content_object
+        # Return file URL; get_for_id() is served from ContentType's cache
+        content_type = ContentType.objects.get_for_id(order_item.content_type_id)
+        file_attr = PRODUCT_FILE_FIELDS.get(content_type.model)
         file_field = None
 
-        if isinstance(product, Book):
-            file_field = product.book_file
-        elif isinstance(product, Course):
-            file_field = product.course_file
-        elif isinstance(product, Webinar):
-            file_field = product.webinar_file
+        if file_attr:
+            file_field = getattr(order_item.content_object, file_attr, None)
 
         if file_field:
             return Response({'download_url': file_field.url})
@@ -409,14 +544,16 @@ class RatingViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """Users can see their own ratings or ratings for their products"""
         user = self.request.user
+        # RatingSerializer reads user.full_name and order_item.content_object.title
+        queryset = Rating.objects.select_related('user', 'order_item').prefetch_related(
+            'order_item__content_object'
+        )
         if user.user_type == 'seller':
             # Sellers see ratings for their products
-            return Rating.objects.filter(
-                order_item__content_object__seller=user
-            )
+            return queryset.filter(seller=user)
         else:
             # Buyers see their own ratings
-            return Rating.objects.filter(user=user)
+            return queryset.filter(user=user)
 
     def perform_create(self, serializer):
         """Set user as current user"""
@@ -437,19 +574,31 @@ class NotificationViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['post'], url_path='mark-all-read')
     def mark_all_read(self, request):
-        """Mark all notifications as read"""
-        updated = Notification.objects.filter(
-            user=request.user,
-            is_read=False
-        ).update(is_read=True)
+        """Mark all notifications as read and return the affected ids"""
+        table = connection.ops.quote_name(Notification._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {table} SET is_read = TRUE "
+                "WHERE user_id = %s AND is_read = FALSE RETURNING id",
+                [request.user.id]
+            )
+            ids = [row[0] for row in cursor.fetchall()]
 
-        return Response({'marked_read': updated})
+        return Response({'marked_read': len(ids), 'ids': ids})
 
     @action(detail=True, methods=['post'], url_path='mark-read')
     def mark_read(self, request, pk=None):
-        """Mark single notification as read"""
-        notification = self.get_object()
-        notification.mark_as_read()
+        """Mark single notification as read with a single UPDATE"""
+        try:
+            notification_id = int(pk)
+        except (TypeError, ValueError):
+            raise Http404
+
+        notifications = self.get_queryset().filter(id=notification_id)
+        notifications.update(is_read=True)
+
+        # The endpoint returns the serialized notification
+        notification = get_object_or_404(notifications)
         serializer = self.get_serializer(notification)
         return Response(serializer.data)
 
@@ -469,8 +618,14 @@ class ChatSessionViewSet(viewsets.ModelViewSet):
 
     @action(detail=True, methods=['post'], url_path='send-message')
     def send_message(self, request, pk=None):
-        """Send message to chatbot"""
-        from .chatbot_helper import search_products, generate_chat_response, get_fallback_response
+        """
+        Send message to chatbot.
+        With "async": true the answer is generated by a Celery task and the
+        message is returned immediately with status 202 and an empty answer;
+        poll the session to pick the answer up. If the broker can't be
+        reached the answer is generated inline and returned with status 200.
+        """
+        from .chatbot_helper import answer_question
 
         session = self.get_object()
         question = request.data.get('question')
@@ -481,31 +636,38 @@ class ChatSessionViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Search for relevant products
-        products = search_products(question, n_results=5)
-
-        # Generate AI response
-        response_stream = generate_chat_response(question, products)
-
-        if response_stream:
-            # Collect streaming response
-            answer = ""
-            try:
-                for chunk in response_stream:
-                    if chunk.choices[0].delta.content:
-                        answer += chunk.choices[0].delta.content
-            except Exception as e:
-                logger.error(f"Error streaming response: {e}")
-                answer = get_fallback_response(question)
-        else:
-            answer = get_fallback_response(question)
+        if request.data.get('async') in (True, 'true', '1', 1):
+            # Keep the worker free during the LLM round-trip
+            message = ChatMessage.objects.create(
+                session=session,
+                user=request.user,
+                question=question,
+                answer=''
+            )
+            serializer = ChatMessageSerializer(message)
+            response = Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+
+            def enqueue():
+                try:
+                    answer_chat_message_task.apply_async(args=(message.id,), retry=False)
+                except Exception as e:
+                    logger.warning(f"Could not queue chat message {message.id}, answering inline: {e}")
+                    message.answer = answer_question(question, n_results=5)
+                    message.save(update_fields=['answer'])
+                    # The request's transaction closes before the response is rendered,
+                    # so the answered message can still replace the 202 body
+                    response.data = ChatMessageSerializer(message).data
+                    response.status_code = status.HTTP_200_OK
+
+            transaction.on_commit(enqueue)
+            return response
 
         # Save message
         message = ChatMessage.objects.create(
             session=session,
             user=request.user,
             question=question,
-            answer=answer
+            answer=answer_question(question, n_results=5)
         )
 
         serializer = ChatMessageSerializer(message)
@@ -0,0 +1,29 @@
+"""
+Authentication backends.
+"""
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+UserModel = get_user_model()
+
+
+class EmailBackend(ModelBackend):
+    """
+    Authenticate with email and password in a single user lookup.
+    Calls without an email fall through to the standard username login.
+    """
+
+    def authenticate(self, request, email=None, password=None, **kwargs):
+        if email is None:
+            return super().authenticate(request, password=password, **kwargs)
+        if password is None:
+            return None
+
+        user = UserModel._default_manager.filter(email=email.lower()).first()
+        if user is None:
+            # Run the password hasher anyway so unknown emails take as long as wrong passwords
+            UserModel().set_password(password)
+            return None
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
@@ -2,7 +2,12 @@
 Chatbot helper module with improved error handling and fallback mechanisms.
 Uses Pinecone for vector storage and OpenAI for embeddings and chat.
 """
+import atexit
+import hashlib
+import importlib.util
+from array import array
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict, Optional
 from django.conf import settings
 from django.core.cache import cache
@@ -12,23 +17,65 @@ logger = logging.getLogger(__name__)
 
 # Optional imports - handle gracefully if not installed
 try:
-    from pinecone import Pinecone, ServerlessSpec
+    from pinecone import ServerlessSpec
     PINECONE_AVAILABLE = True
+    try:
+        # gRPC transport (pinecone[grpc]) upserts and queries faster than REST
+        from pinecone.grpc import PineconeGRPC as PineconeClient
+        PINECONE_GRPC = True
+    except ImportError:
+        from pinecone import Pinecone as PineconeClient
+        PINECONE_GRPC = False
 except ImportError:
     logger.warning("Pinecone package not installed - vector search features will be disabled")
-    Pinecone = None
+    PineconeClient = None
     ServerlessSpec = None
     PINECONE_AVAILABLE = False
+    PINECONE_GRPC = False
 
 try:
     from openai import OpenAI, OpenAIError
+    import httpx  # Installed with openai
     OPENAI_AVAILABLE = True
 except ImportError:
     logger.warning("OpenAI package not installed - AI chat features will be disabled")
     OpenAI = None
     OpenAIError = Exception
+    httpx = None
     OPENAI_AVAILABLE = False
 
+# httpx speaks HTTP/2 when the h2 package is installed
+HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    tiktoken = None
+    TIKTOKEN_AVAILABLE = False
+
+# Embeddings come from OpenAI unless a local model is configured and installed.
+# sentence-transformers pulls in torch, so it is only probed here and imported on first use.
+USE_LOCAL_EMBEDDINGS = getattr(settings, 'EMBEDDING_BACKEND', 'openai') == 'local'
+if USE_LOCAL_EMBEDDINGS and importlib.util.find_spec('sentence_transformers') is None:
+    logger.warning("EMBEDDING_BACKEND=local but sentence-transformers is not installed - using OpenAI")
+    USE_LOCAL_EMBEDDINGS = False
+
+# Embedding model; its dimension must match the Pinecone index
+if USE_LOCAL_EMBEDDINGS:
+    EMBEDDING_MODEL = settings.LOCAL_EMBEDDING_MODEL
+else:
+    EMBEDDING_MODEL = "text-embedding-3-small"
+
+# Chat model and the prompt size (system + history + question) sent to it
+CHAT_MODEL = "gpt-3.5-turbo"
+CHAT_PROMPT_TOKEN_BUDGET = 3000
+
+# Inputs per embeddings request when indexing in bulk
+EMBEDDING_BATCH_SIZE = 100
+# Concurrent embedding requests during bulk indexing (bounded by the API rate limit)
+EMBEDDING_MAX_WORKERS = 8
+
 # Initialize clients with error handling
 openai_client = None
 pc = None
@@ -36,8 +83,16 @@ INDEX_NAME = None
 
 if OPENAI_AVAILABLE and PINECONE_AVAILABLE:
     try:
-        openai_client = OpenAI(api_key=settings.OPENAI_API_KEY)
-        pc = Pinecone(api_key=settings.PINECONE_API_KEY)
+        # One pooled HTTP client per process keeps TLS connections to OpenAI alive
+        # between requests; sized for the concurrent embedding workers
+        http_client = httpx.Client(
+            http2=HTTP2_AVAILABLE,
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+        )
+        atexit.register(http_client.close)
+        openai_client = OpenAI(api_key=settings.OPENAI_API_KEY, http_client=http_client)
+        pc = PineconeClient(api_key=settings.PINECONE_API_KEY)
         INDEX_NAME = settings.PINECONE_INDEX_NAME
         logger.info("AI clients initialized successfully")
     except Exception as e:
@@ -49,14 +104,79 @@ else:
     logger.warning("AI services unavailable - missing required packages (pinecone or openai)")
 
 
+def _canonical_text(text: str) -> str:
+    """Lowercase and collapse whitespace so trivially different inputs share a cache key"""
+    return " ".join(text.lower().split())
+
+
+def _text_digest(text: str) -> str:
+    """
+    Stable digest of text for cache keys.
+    hash() is salted per process, so keys built from it never match across workers.
+    """
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+# Local embedding model, loaded on first use
+_local_model = None
+
+
+def _get_local_model():
+    """Load the local sentence-transformers model once per process"""
+    global _local_model
+    if _local_model is None:
+        from sentence_transformers import SentenceTransformer
+        _local_model = SentenceTransformer(EMBEDDING_MODEL)
+        logger.info(f"Loaded local embedding model: {EMBEDDING_MODEL}")
+    return _local_model
+
+
+def _embedding_dimension() -> int:
+    """Vector size produced by the configured embedding model"""
+    if USE_LOCAL_EMBEDDINGS:
+        return _get_local_model().get_sentence_embedding_dimension()
+    return 1536  # OpenAI text-embedding-3-small dimension
+
+
+def _local_embeddings(texts: List[str], batch_size: int) -> List[List[float]]:
+    """Embed texts with the local model (L2-normalized, for cosine similarity)"""
+    vectors = _get_local_model().encode(
+        texts,
+        batch_size=batch_size,
+        normalize_embeddings=True,
+        show_progress_bar=False
+    )
+    return [vector.tolist() for vector in vectors]
+
+
 def is_ai_available() -> bool:
     """Check if AI services are available"""
     return openai_client is not None and pc is not None
 
 
+# Index handle resolved by get_or_create_index(), reused for the process
+_index = None
+
+
+def reset_index_cache():
+    """Forget the cached index handle so the next call re-resolves it"""
+    global _index
+    _index = None
+
+
+def _is_conflict(error: Exception) -> bool:
+    """True if a Pinecone error means the index already exists"""
+    return (
+        getattr(error, 'status', None) == 409
+        or 'Conflict' in type(error).__name__
+        or 'ALREADY_EXISTS' in str(error)
+    )
+
+
 def get_or_create_index():
     """
     Get existing Pinecone index or create a new one.
+    The handle is cached at module level; callers reset it on failure.
 
     Returns:
         Pinecone Index object or None if unavailable
@@ -64,38 +184,60 @@ def get_or_create_index():
     Raises:
         Exception: If index creation/retrieval fails
     """
+    global _index
+    if _index is not None:
+        return _index
+
     if not pc:
         logger.error("Pinecone client not initialized")
         return None
 
+    # Create unconditionally; Pinecone answers 409 Conflict if the index exists,
+    # which saves a list_indexes round trip on every cold start
     try:
-        # Check if index exists
-        existing_indexes = pc.list_indexes()
-        index_names = [idx.name if hasattr(idx, 'name') else idx['name'] for idx in existing_indexes]
-
-        if INDEX_NAME not in index_names:
-            # Create new index
-            logger.info(f"Creating new Pinecone index: {INDEX_NAME}")
-            pc.create_index(
-                name=INDEX_NAME,
-                dimension=1536,  # OpenAI text-embedding-3-small dimension
-                metric='cosine',
-                spec=ServerlessSpec(
-                    cloud='aws',
-                    region='us-east-1'
-                )
+        pc.create_index(
+            name=INDEX_NAME,
+            dimension=_embedding_dimension(),
+            metric='cosine',
+            spec=ServerlessSpec(
+                cloud='aws',
+                region='us-east-1'
             )
-            logger.info(f"Created new Pinecone index: {INDEX_NAME}")
+        )
+        logger.info(f"Created new Pinecone index: {INDEX_NAME}")
+    except Exception as e:
+        if not _is_conflict(e):
+            # e.g. 403 for keys without control-plane access; the index may still
+            # exist and be usable, so only a failure to open it disables search
+            logger.warning(f"Could not create Pinecone index {INDEX_NAME}, opening the existing one: {e}")
 
-        return pc.Index(INDEX_NAME)
+    try:
+        _index = pc.Index(INDEX_NAME)
+        return _index
     except Exception as e:
         logger.error(f"Error creating/getting Pinecone index: {e}")
         return None
 
 
+def _quantize_embedding(embedding: List[float]) -> tuple:
+    """
+    int8-quantize an embedding for the cache: (scale, bytes), a quarter of the float size.
+    Cosine similarity against the original stays within ~0.1%.
+    """
+    scale = max(abs(value) for value in embedding) / 127 or 1.0
+    return scale, array('b', [round(value / scale) for value in embedding]).tobytes()
+
+
+def _dequantize_embedding(cached) -> List[float]:
+    """Inverse of _quantize_embedding"""
+    scale, packed = cached
+    return [value * scale for value in array('b', packed)]
+
+
 def generate_embedding(text: str, use_cache: bool = True) -> Optional[List[float]]:
     """
-    Generate OpenAI embedding for given text with caching.
+    Generate an embedding for given text with caching.
+    Uses the local model when EMBEDDING_BACKEND is 'local', OpenAI otherwise.
 
     Args:
         text: Text to generate embedding for
@@ -104,28 +246,31 @@ def generate_embedding(text: str, use_cache: bool = True) -> Optional[List[float
     Returns:
         List of embedding values or None if failed
     """
-    if not openai_client:
+    if not USE_LOCAL_EMBEDDINGS and not openai_client:
         logger.error("OpenAI client not initialized")
         return None
 
     # Check cache first
+    # Tag with the model so a model change never serves vectors of another space
+    cache_key = f'embedding_q8_{EMBEDDING_MODEL}_{_text_digest(_canonical_text(text))}'
     if use_cache:
-        cache_key = f'embedding_{hash(text)}'
         cached = cache.get(cache_key)
         if cached:
-            return cached
+            return _dequantize_embedding(cached)
 
     try:
-        response = openai_client.embeddings.create(
-            model="text-embedding-3-small",
-            input=text[:8000]  # Limit text length
-        )
-        embedding = response.data[0].embedding
+        if USE_LOCAL_EMBEDDINGS:
+            embedding = _local_embeddings([text], batch_size=1)[0]
+        else:
+            response = openai_client.embeddings.create(
+                model=EMBEDDING_MODEL,
+                input=text[:8000]  # Limit text length
+            )
+            embedding = response.data[0].embedding
 
-        # Cache the embedding for 1 hour
+        # Cache the embedding (int8) for 1 hour
         if use_cache:
-            cache_key = f'embedding_{hash(text)}'
-            cache.set(cache_key, embedding, 3600)
+            cache.set(cache_key, _quantize_embedding(embedding), 3600)
 
         return embedding
     except OpenAIError as e:
@@ -136,6 +281,76 @@ def generate_embedding(text: str, use_cache: bool = True) -> Optional[List[float
         return None
 
 
+def generate_embeddings(texts: List[str], batch_size: int = EMBEDDING_BATCH_SIZE) -> List[Optional[List[float]]]:
+    """
+    Generate embeddings for many texts, batch_size inputs per API call
+    (or per local model batch). Duplicate texts are embedded once.
+
+    Args:
+        texts: Texts to generate embeddings for
+        batch_size: Maximum inputs per embeddings request
+
+    Returns:
+        List aligned with texts; None where a batch failed
+    """
+    if not USE_LOCAL_EMBEDDINGS and not openai_client:
+        logger.error("OpenAI client not initialized")
+        return [None] * len(texts)
+
+    unique_texts = list(dict.fromkeys(texts))
+    embeddings = {}
+
+    if USE_LOCAL_EMBEDDINGS:
+        try:
+            embeddings = dict(zip(unique_texts, _local_embeddings(unique_texts, batch_size)))
+        except Exception as e:
+            logger.error(f"Error generating local embeddings: {e}")
+        return [embeddings.get(text) for text in texts]
+
+    batches = [unique_texts[i:i + batch_size] for i in range(0, len(unique_texts), batch_size)]
+
+    # Batches are independent network calls; overlap them
+    with ThreadPoolExecutor(max_workers=min(EMBEDDING_MAX_WORKERS, len(batches) or 1)) as executor:
+        futures = {executor.submit(_embed_batch, batch): n for n, batch in enumerate(batches)}
+        for future in as_completed(futures):
+            try:
+                embeddings.update(future.result())
+            except OpenAIError as e:
+                logger.error(f"OpenAI API error generating embedding batch {futures[future]}: {e}")
+            except Exception as e:
+                logger.error(f"Unexpected error generating embedding batch {futures[future]}: {e}")
+
+    return [embeddings.get(text) for text in texts]
+
+
+def _embed_batch(batch: List[str]) -> Dict[str, List[float]]:
+    """Embed one batch with a single OpenAI request, keyed by input text"""
+    response = openai_client.embeddings.create(
+        model=EMBEDDING_MODEL,
+        input=[text[:8000] for text in batch]  # Limit text length
+    )
+    return {batch[item.index]: item.embedding for item in response.data}
+
+
+def _document_digest(doc_text: str) -> str:
+    """Digest stored in embedding_hash; changes with the document or the embedding model"""
+    return _text_digest(f"{EMBEDDING_MODEL}\n{doc_text}")
+
+
+def _product_document(product, product_type: str) -> str:
+    """
+    Text embedded for a product. Single and bulk indexing both use it,
+    so an unchanged product always gets the same embedding_hash.
+    """
+    return (
+        f"{product_type.title()}: {product.title}. "
+        f"Description: {product.description}. "
+        f"Category: {product.category.name if product.category else 'Uncategorized'}. "
+        f"Price: ${product.price}. "
+        f"Seller: {product.seller.full_name}"
+    )
+
+
 def index_single_product(product, product_type: str) -> bool:
     """
     Index a single product into Pinecone.
@@ -157,18 +372,19 @@ def index_single_product(product, product_type: str) -> bool:
             return False
 
         # Create document text
-        doc_text = (
-            f"{product_type.title()}: {product.title}. "
-            f"Description: {product.description}. "
-            f"Category: {product.category.name if product.category else 'Uncategorized'}. "
-            f"Price: ${product.price}. "
-            f"Seller: {product.seller.full_name}"
-        )
+        doc_text = _product_document(product, product_type)
 
-        # Generate embedding
-        embedding = generate_embedding(doc_text)
-        if not embedding:
-            return False
+        # Reuse the stored embedding while the document is unchanged
+        digest = _document_digest(doc_text)
+        if product.embedding_hash == digest and product.embedding:
+            embedding = product.embedding
+        else:
+            # Full precision: this vector is stored and upserted, not a short-lived cache entry
+            embedding = generate_embedding(doc_text, use_cache=False)
+            if not embedding:
+                return False
+            # update() rather than save(): no timestamps or cache invalidation for this
+            type(product).objects.filter(pk=product.pk).update(embedding=embedding, embedding_hash=digest)
 
         # Create unique ID
         vector_id = f"{product_type}_{product.id}"
@@ -191,6 +407,7 @@ def index_single_product(product, product_type: str) -> bool:
         return True
     except Exception as e:
         logger.error(f"Error indexing product {product_type} {product.id}: {e}")
+        reset_index_cache()
         return False
 
 
@@ -219,9 +436,17 @@ def delete_product_from_index(product_id: int, product_type: str) -> bool:
         return True
     except Exception as e:
         logger.error(f"Error deleting product from index: {e}")
+        reset_index_cache()
         return False
 
 
+# Columns read when building documents for a bulk reindex
+INDEX_FIELDS = (
+    'id', 'title', 'description', 'price', 'embedding', 'embedding_hash',
+    'category__name', 'seller__full_name'
+)
+
+
 def index_all_products() -> int:
     """
     Index all active products into Pinecone.
@@ -238,96 +463,101 @@ def index_all_products() -> int:
         if not index:
             return 0
 
-        # Get all active, non-deleted products
-        books = Book.objects.filter(is_active=True, is_deleted=False).select_related('category', 'seller')
-        courses = Course.objects.filter(is_active=True, is_deleted=False).select_related('category', 'seller')
-        webinars = Webinar.objects.filter(is_active=True, is_deleted=False).select_related('category', 'seller')
-
-        vectors = []
-        successful_count = 0
-
-        # Process books
-        for book in books:
-            try:
-                doc_text = f"Book: {book.title}. Description: {book.description}. Category: {book.category.name if book.category else 'Uncategorized'}. Price: ${book.price}"
-                embedding = generate_embedding(doc_text)
-
-                if embedding:
-                    metadata = {
-                        'type': 'book',
-                        'id': str(book.id),
-                        'title': book.title[:500],
-                        'description': book.description[:500],
-                        'price': str(book.price),
-                        'category': book.category.name if book.category else 'Uncategorized',
-                        'seller': book.seller.full_name,
-                        'seller_id': str(book.seller.id)
-                    }
-                    vectors.append((f"book_{book.id}", embedding, metadata))
-                    successful_count += 1
-            except Exception as e:
-                logger.error(f"Error processing book {book.id}: {e}")
-
-        # Process courses
-        for course in courses:
-            try:
-                doc_text = f"Course: {course.title}. Description: {course.description}. Category: {course.category.name if course.category else 'Uncategorized'}. Price: ${course.price}"
-                embedding = generate_embedding(doc_text)
-
-                if embedding:
-                    metadata = {
-                        'type': 'course',
-                        'id': str(course.id),
-                        'title': course.title[:500],
-                        'description': course.description[:500],
-                        'price': str(course.price),
-                        'category': course.category.name if course.category else 'Uncategorized',
-                        'seller': course.seller.full_name,
-                        'seller_id': str(course.seller.id)
-                    }
-                    vectors.append((f"course_{course.id}", embedding, metadata))
-                    successful_count += 1
-            except Exception as e:
-                logger.error(f"Error processing course {course.id}: {e}")
-
-        # Process webinars
-        for webinar in webinars:
-            try:
-                doc_text = f"Webinar: {webinar.title}. Description: {webinar.description}. Category: {webinar.category.name if webinar.category else 'Uncategorized'}. Price: ${webinar.price}"
-                embedding = generate_embedding(doc_text)
-
-                if embedding:
+        # Build every document first so embeddings can be requested in batches.
+        # Rows are streamed and only the indexed columns are fetched.
+        vector_ids, documents, metadatas, embeddings = [], [], [], []
+        stale = []  # (position, product, digest) for documents that need a new embedding
+        for product_type, model in (('book', Book), ('course', Course), ('webinar', Webinar)):
+            products = (
+                model.objects.filter(is_active=True, is_deleted=False)
+                .select_related('category', 'seller')
+                .defer(None)  # Clear the manager's default defer('embedding')
+                .only(*INDEX_FIELDS)
+                .iterator(chunk_size=500)
+            )
+            for product in products:
+                try:
+                    category_name = product.category.name if product.category else 'Uncategorized'
+                    doc_text = _product_document(product, product_type)
                     metadata = {
-                        'type': 'webinar',
-                        'id': str(webinar.id),
-                        'title': webinar.title[:500],
-                        'description': webinar.description[:500],
-                        'price': str(webinar.price),
-                        'category': webinar.category.name if webinar.category else 'Uncategorized',
-                        'seller': webinar.seller.full_name,
-                        'seller_id': str(webinar.seller.id)
+                        'type': product_type,
+                        'id': str(product.id),
+                        'title': product.title[:500],
+                        'description': product.description[:500],
+                        'price': str(product.price),
+                        'category': category_name,
+                        'seller': product.seller.full_name,
+                        'seller_id': str(product.seller_id)
                     }
-                    vectors.append((f"webinar_{webinar.id}", embedding, metadata))
-                    successful_count += 1
-            except Exception as e:
-                logger.error(f"Error processing webinar {webinar.id}: {e}")
+                    digest = _document_digest(doc_text)
+                    if product.embedding_hash == digest and product.embedding:
+                        embeddings.append(product.embedding)
+                    else:
+                        stale.append((len(embeddings), product, digest))
+                        embeddings.append(None)
+                    vector_ids.append(f"{product_type}_{product.id}")
+                    documents.append(doc_text)
+                    metadatas.append(metadata)
+                except Exception as e:
+                    logger.error(f"Error processing {product_type} {product.id}: {e}")
+
+        # Only new or changed documents go to the embeddings API
+        fresh = generate_embeddings([documents[position] for position, _, _ in stale])
+        changed = {}
+        for (position, product, digest), embedding in zip(stale, fresh):
+            if embedding:
+                embeddings[position] = embedding
+                product.embedding = embedding
+                product.embedding_hash = digest
+                changed.setdefault(type(product), []).append(product)
+        for model, products in changed.items():
+            model.objects.bulk_update(products, ['embedding', 'embedding_hash'], batch_size=500)
+        logger.info(f"Embedded {len(stale)} changed products, reused {len(documents) - len(stale)}")
+
+        vectors = [
+            (vector_id, embedding, metadata)
+            for vector_id, embedding, metadata in zip(vector_ids, embeddings, metadatas)
+            if embedding
+        ]
+        successful_count = len(vectors)
 
         # Batch upsert to Pinecone (max 100 at a time)
         batch_size = 100
-        for i in range(0, len(vectors), batch_size):
-            batch = vectors[i:i + batch_size]
-            try:
-                index.upsert(vectors=batch)
-            except Exception as e:
-                logger.error(f"Error upserting batch {i//batch_size}: {e}")
+        if PINECONE_GRPC:
+            # Send every batch up front, then wait on the futures
+            futures = [
+                index.upsert(vectors=vectors[i:i + batch_size], async_req=True)
+                for i in range(0, len(vectors), batch_size)
+            ]
+            for batch_number, future in enumerate(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.error(f"Error upserting batch {batch_number}: {e}")
+        else:
+            for i in range(0, len(vectors), batch_size):
+                batch = vectors[i:i + batch_size]
+                try:
+                    index.upsert(vectors=batch)
+                except Exception as e:
+                    logger.error(f"Error upserting batch {i//batch_size}: {e}")
 
         logger.info(f"Successfully indexed {successful_count} products to Pinecone")
         return successful_count
     except Exception as e:
         logger.error(f"Error indexing all products: {e}")
+        reset_index_cache()
         return 0
 
 
+def _search_cache_key(query: str, n_results: int) -> str:
+    """
+    Cache key for search results, shared by every worker.
+    Case and whitespace differences map to the same entry.
+    """
+    return f'search_{EMBEDDING_MODEL}_{_text_digest(_canonical_text(query))}_{n_results}'
+
+
 def search_products(query: str, n_results: int = 5) -> List[Dict]:
     """
     Search for relevant products based on user query.
@@ -344,9 +574,9 @@ def search_products(query: str, n_results: int = 5) -> List[Dict]:
         return []
 
     # Check cache first
-    cache_key = f'search_{hash(query)}_{n_results}'
+    cache_key = _search_cache_key(query, n_results)
     cached = cache.get(cache_key)
-    if cached:
+    if cached is not None:  # [] is a cached "no matches"
         return cached
 
     try:
@@ -372,15 +602,62 @@ def search_products(query: str, n_results: int = 5) -> List[Dict]:
             if match.get('metadata'):
                 products.append(match['metadata'])
 
-        # Cache results for 5 minutes
-        cache.set(cache_key, products, 300)
+        # Cache results for an hour; "no matches" only briefly, to absorb repeats
+        # while new products can still show up. Failures above are not cached.
+        cache.set(cache_key, products, 3600 if products else 60)
 
         return products
     except Exception as e:
         logger.error(f"Error searching products: {e}")
+        reset_index_cache()
         return []
 
 
+# Absolute product detail URL with {type}/{id} placeholders, resolved on first use
+_product_url_template = None
+
+
+def _product_url(product_type: str, product_id: int) -> str:
+    """Absolute link to a product page without a URLconf lookup per product"""
+    global _product_url_template
+    if _product_url_template is None:
+        from django.urls import reverse
+        path = reverse('product_detail', args=['__type__', 0])
+        _product_url_template = settings.SITE_URL + path.replace('__type__', '{type}').replace('/0/', '/{id}/')
+    return _product_url_template.format(type=product_type, id=product_id)
+
+
+# Tokenizer for CHAT_MODEL, loaded on first use
+_encoding = None
+
+
+def _count_tokens(text: str) -> int:
+    """Token count for CHAT_MODEL; estimated at ~4 characters per token without tiktoken"""
+    global _encoding
+    if not TIKTOKEN_AVAILABLE:
+        return len(text) // 4 + 1
+    if _encoding is None:
+        _encoding = tiktoken.encoding_for_model(CHAT_MODEL)
+    return len(_encoding.encode(text))
+
+
+def _fit_history(history: List[Dict], budget: int) -> List[Dict]:
+    """
+    Most recent messages from history that fit in budget tokens.
+    Older messages are dropped first; the result never starts with an assistant reply.
+    """
+    kept = []
+    for message in reversed(history):
+        budget -= _count_tokens(message['content']) + 4  # Per-message framing overhead
+        if budget < 0:
+            break
+        kept.append(message)
+    kept.reverse()
+    while kept and kept[0]['role'] == 'assistant':
+        kept.pop(0)
+    return kept
+
+
 def generate_chat_response(query: str, context_products: List[Dict], conversation_history: Optional[List[Dict]] = None):
     """
     Generate AI response using OpenAI Chat API with streaming and conversation memory.
@@ -399,26 +676,27 @@ def generate_chat_response(query: str, context_products: List[Dict], conversatio
         return None
 
     try:
-        from django.urls import reverse
-
         # Build context from products
         if context_products:
-            context = "Here are the relevant products from our catalog:\n\n"
+            parts = ["Here are the relevant products from our catalog:\n\n"]
             for i, product in enumerate(context_products[:5], 1):
                 try:
                     product_id = int(product.get('id', 0))
                     product_type = product.get('type', 'book')
-                    product_url = f"http://127.0.0.1:8000{reverse('product_detail', args=[product_type, product_id])}"
+                    product_url = _product_url(product_type, product_id)
                     product_title = product.get('title', 'Unknown')
 
-                    context += f"{i}. {product.get('type', '').title()}: {product_title}\n"
-                    context += f"   Price: ${product.get('price', '0')}\n"
-                    context += f"   Category: {product.get('category', 'Uncategorized')}\n"
-                    context += f"   Seller: {product.get('seller', 'Unknown')}\n"
-                    context += f"   Product Link: [{product_title}]({product_url})\n"
-                    context += f"   Description: {product.get('description', '')[:200]}...\n\n"
+                    parts.append(
+                        f"{i}. {product.get('type', '').title()}: {product_title}\n"
+                        f"   Price: ${product.get('price', '0')}\n"
+                        f"   Category: {product.get('category', 'Uncategorized')}\n"
+                        f"   Seller: {product.get('seller', 'Unknown')}\n"
+                        f"   Product Link: [{product_title}]({product_url})\n"
+                        f"   Description: {product.get('description', '')[:200]}...\n\n"
+                    )
                 except Exception as e:
                     logger.error(f"Error processing product {i}: {e}")
+            context = "".join(parts)
         else:
             context = "No products found matching your query."
 
@@ -452,11 +730,13 @@ Provide a helpful response that matches the question's needs - short for simple
         # Build messages array with conversation history
         messages = [{"role": "system", "content": system_prompt}]
 
-        # Add conversation history if available (limited to prevent token overflow)
+        # Add conversation history if available, oldest messages dropped to fit the token budget
         if conversation_history:
-            # Take only the last 10 message pairs (20 messages) to stay within token limits
+            # Take only the last 10 message pairs (20 messages) at most
             history_limit = 20
-            recent_history = conversation_history[-history_limit:] if len(conversation_history) > history_limit else conversation_history
+            recent_history = conversation_history[-history_limit:]
+            budget = CHAT_PROMPT_TOKEN_BUDGET - _count_tokens(system_prompt) - _count_tokens(user_prompt)
+            recent_history = _fit_history(recent_history, budget)
             messages.extend(recent_history)
             logger.info(f"Added {len(recent_history)} messages from conversation history")
 
@@ -465,7 +745,7 @@ Provide a helpful response that matches the question's needs - short for simple
 
         # Call OpenAI Chat API with streaming
         response = openai_client.chat.completions.create(
-            model="gpt-3.5-turbo",
+            model=CHAT_MODEL,
             messages=messages,
             temperature=0.7,
             max_tokens=300,
@@ -496,3 +776,32 @@ def get_fallback_response(query: str) -> str:
         "Please try browsing our categories or using the search function to find products. "
         "If you need assistance, please contact our support team."
     )
+
+
+def answer_question(query: str, n_results: int = 5) -> str:
+    """
+    Search the catalog and collect the full chat response for a question.
+    Falls back to get_fallback_response() when AI is unavailable or the
+    stream fails.
+
+    Args:
+        query: User's question
+        n_results: Number of products to use as context
+
+    Returns:
+        Answer text
+    """
+    products = search_products(query, n_results=n_results)
+    response_stream = generate_chat_response(query, products)
+    if not response_stream:
+        return get_fallback_response(query)
+
+    parts = []
+    try:
+        for chunk in response_stream:
+            if chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+    except Exception as e:
+        logger.error(f"Error streaming response: {e}")
+        return get_fallback_response(query)
+    return "".join(parts)
@@ -0,0 +1,21 @@
+"""
+Cached choice lists for forms.
+"""
+from django.core.cache import cache
+
+from .models import Category
+
+
+def get_main_category_choices():
+    """
+    (id, name) pairs of active main categories, cached until a category is saved or deleted.
+    Keyed by the category list version token that Category.save()/delete() drop.
+    """
+    version = Category.list_cache_token()
+    return cache.get_or_set(
+        f'main_category_choices_{version}',
+        lambda: list(
+            Category.objects.filter(is_main_category=True, is_active=True).values_list('id', 'name')
+        ),
+        300
+    )
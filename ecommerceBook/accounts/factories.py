@@ -4,8 +4,6 @@ Uses factory_boy for efficient test data generation.
 """
 import factory
 from factory.django import DjangoModelFactory
-from faker import Faker
-from decimal import Decimal
 
 from .models import (
     User, Category, Book, Course, Webinar, Cart, CartItem,
@@ -13,8 +11,6 @@ from .models import (
     ChatMessage, UserPreference
 )
 
-fake = Faker()
-
 
 class UserFactory(DjangoModelFactory):
     """Factory for User model"""
@@ -59,10 +55,28 @@ class CategoryFactory(DjangoModelFactory):
 
     name = factory.Sequence(lambda n: f'Category {n}')
     description = factory.Faker('paragraph')
+    is_main_category = True  # Category.clean() requires a parent otherwise
     is_active = True
 
 
-class BookFactory(DjangoModelFactory):
+class BulkProductFactoryMixin:
+    """Bulk creation for product factories"""
+
+    @classmethod
+    def create_bulk(cls, n, **kwargs):
+        """
+        Create n products sharing one category and seller with a single bulk INSERT.
+        Bypasses model save(), so list caches are not invalidated.
+        """
+        if 'category' not in kwargs:
+            kwargs['category'] = CategoryFactory()
+        if 'seller' not in kwargs:
+            kwargs['seller'] = SellerFactory()
+        products = cls.build_batch(n, **kwargs)
+        return cls._meta.model.objects.bulk_create(products, batch_size=500)
+
+
+class BookFactory(BulkProductFactoryMixin, DjangoModelFactory):
     """Factory for Book model"""
 
     class Meta:
@@ -70,14 +84,14 @@ class BookFactory(DjangoModelFactory):
 
     title = factory.Faker('sentence', nb_words=4)
     description = factory.Faker('paragraph')
-    price = factory.LazyFunction(lambda: Decimal(str(fake.random.uniform(9.99, 99.99))))
+    price = factory.Faker('pydecimal', left_digits=2, right_digits=2, positive=True, min_value=10, max_value=99)
     category = factory.SubFactory(CategoryFactory)
     seller = factory.SubFactory(SellerFactory)
     is_active = True
     is_deleted = False
 
 
-class CourseFactory(DjangoModelFactory):
+class CourseFactory(BulkProductFactoryMixin, DjangoModelFactory):
     """Factory for Course model"""
 
     class Meta:
@@ -85,7 +99,7 @@ class CourseFactory(DjangoModelFactory):
 
     title = factory.Faker('sentence', nb_words=4)
     description = factory.Faker('paragraph')
-    price = factory.LazyFunction(lambda: Decimal(str(fake.random.uniform(49.99, 299.99))))
+    price = factory.Faker('pydecimal', left_digits=3, right_digits=2, positive=True, min_value=50, max_value=299)
     category = factory.SubFactory(CategoryFactory)
     seller = factory.SubFactory(SellerFactory)
     duration_hours = factory.Faker('random_int', min=10, max=100)
@@ -93,7 +107,7 @@ class CourseFactory(DjangoModelFactory):
     is_deleted = False
 
 
-class WebinarFactory(DjangoModelFactory):
+class WebinarFactory(BulkProductFactoryMixin, DjangoModelFactory):
     """Factory for Webinar model"""
 
     class Meta:
@@ -101,7 +115,7 @@ class WebinarFactory(DjangoModelFactory):
 
     title = factory.Faker('sentence', nb_words=4)
     description = factory.Faker('paragraph')
-    price = factory.LazyFunction(lambda: Decimal(str(fake.random.uniform(19.99, 99.99))))
+    price = factory.Faker('pydecimal', left_digits=2, right_digits=2, positive=True, min_value=20, max_value=99)
     category = factory.SubFactory(CategoryFactory)
     seller = factory.SubFactory(SellerFactory)
     scheduled_date = factory.Faker('future_datetime')
@@ -127,7 +141,7 @@ class OrderFactory(DjangoModelFactory):
     user = factory.SubFactory(BuyerFactory)
     order_number = factory.Sequence(lambda n: f'ORD{100000 + n}')
     status = 'completed'
-    total_amount = factory.LazyFunction(lambda: Decimal(str(fake.random.uniform(10.00, 500.00))))
+    total_amount = factory.Faker('pydecimal', left_digits=3, right_digits=2, positive=True, min_value=10, max_value=499)
 
 
 class RatingFactory(DjangoModelFactory):
@@ -1,20 +1,38 @@
 from django import forms
 from django.contrib.auth.forms import UserCreationForm, AuthenticationForm
 from django.contrib.auth import authenticate
-from .models import User, Book, Category, Course, Webinar, Service
+from django.forms.models import ModelChoiceIterator
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from .choices import get_main_category_choices
+from .models import User, Book, Category, Course, Webinar, Service, PasswordResetToken
+from .validators import validate_file_signature
+
+# Tailwind classes shared by form widgets
+REGISTER_INPUT_CLASS = 'w-full px-3 sm:px-4 py-2 sm:py-2 text-sm text-gray-700 bg-[#F9F9F9] border border-gray-300 rounded-lg focus:outline-none focus:border-gray-300'
+AUTH_INPUT_CLASS = 'w-full px-4 py-3 text-sm text-gray-700 bg-[#F9F9F9] border border-gray-300 rounded-lg focus:outline-none focus:border-gray-300'
+PRODUCT_INPUT_CLASS = 'w-full h-11 bg-zinc-50 rounded-md border border-gray-300 px-4 focus:outline-none focus:border-gray-300'
+PRODUCT_TEXTAREA_CLASS = 'w-full min-h-[150px] md:min-h-[200px] bg-zinc-50 rounded-md border border-gray-300 p-4 focus:outline-none focus:border-gray-300'
+
+# Upload extensions accepted by the product forms (lowercase, no dot)
+_BOOK_EXTS = frozenset({'zip', 'pdf', 'epub', 'mobi'})
+_COURSE_EXTS = frozenset({'zip', 'pdf', 'mp4', 'avi', 'mov', 'wmv'})
+_WEBINAR_EXTS = frozenset({'zip', 'mp4', 'avi', 'mov', 'wmv'})
+_IMAGE_EXTS = frozenset({'jpeg', 'jpg', 'png'})
+
 
 class UserRegistrationForm(UserCreationForm):
     full_name = forms.CharField(
         max_length=255,
         widget=forms.TextInput(attrs={
             'placeholder': 'Enter Full Name',
-            'class': 'w-full px-3 sm:px-4 py-2 sm:py-2 text-sm text-gray-700 bg-[#F9F9F9] border border-gray-300 rounded-lg focus:outline-none focus:border-gray-300'
+            'class': REGISTER_INPUT_CLASS
         })
     )
     email = forms.EmailField(
         widget=forms.EmailInput(attrs={
             'placeholder': 'Enter Email',
-            'class': 'w-full px-3 sm:px-4 py-2 sm:py-2 text-sm text-gray-700 bg-[#F9F9F9] border border-gray-300 rounded-lg focus:outline-none focus:border-gray-300'
+            'class': REGISTER_INPUT_CLASS
         })
     )
     user_type = forms.ChoiceField(
@@ -25,13 +43,13 @@ class UserRegistrationForm(UserCreationForm):
     password1 = forms.CharField(
         widget=forms.PasswordInput(attrs={
             'placeholder': 'Enter Password',
-            'class': 'w-full px-3 sm:px-4 py-2 sm:py-2 text-sm text-gray-700 bg-[#F9F9F9] border border-gray-300 rounded-lg focus:outline-none focus:border-gray-300'
+            'class': REGISTER_INPUT_CLASS
         })
     )
     password2 = forms.CharField(
         widget=forms.PasswordInput(attrs={
             'placeholder': 'Confirm Password',
-            'class': 'w-full px-3 sm:px-4 py-2 sm:py-2 text-sm text-gray-700 bg-[#F9F9F9] border border-gray-300 rounded-lg focus:outline-none focus:border-gray-300'
+            'class': REGISTER_INPUT_CLASS
         })
     )
 
@@ -41,13 +59,13 @@ class UserRegistrationForm(UserCreationForm):
         widgets = {
             'username': forms.TextInput(attrs={
                 'placeholder': 'Username',
-                'class': 'w-full px-3 sm:px-4 py-2 sm:py-2 text-sm text-gray-700 bg-[#F9F9F9] border border-gray-300 rounded-lg focus:outline-none focus:border-gray-300'
+                'class': REGISTER_INPUT_CLASS
             })
         }
 
     def save(self, commit=True):
         user = super().save(commit=False)
-        user.email = self.cleaned_data['email']
+        user.email = self.cleaned_data['email'].lower()
         user.full_name = self.cleaned_data['full_name']
         user.user_type = self.cleaned_data['user_type']
         if commit:
@@ -58,13 +76,13 @@ class UserLoginForm(forms.Form):
     email = forms.EmailField(
         widget=forms.EmailInput(attrs={
             'placeholder': 'Enter Email',
-            'class': 'w-full px-4 py-3 text-sm text-gray-700 bg-[#F9F9F9] border border-gray-300 rounded-lg focus:outline-none focus:border-gray-300'
+            'class': AUTH_INPUT_CLASS
         })
     )
     password = forms.CharField(
         widget=forms.PasswordInput(attrs={
             'placeholder': 'Enter Password',
-            'class': 'w-full px-4 py-3 text-sm text-gray-700 bg-[#F9F9F9] border border-gray-300 rounded-lg focus:outline-none focus:border-gray-300'
+            'class': AUTH_INPUT_CLASS
         })
     )
     remember_me = forms.BooleanField(required=False)
@@ -79,20 +97,11 @@ class UserLoginForm(forms.Form):
         password = cleaned_data.get('password')
 
         if email and password:
-            try:
-                # Find user by email since they login with email
-                user = User.objects.get(email=email)
-                username = user.username
-            except User.DoesNotExist:
-                raise forms.ValidationError('Invalid email or password.')
-
-            # Authenticate with username and password
-            user = authenticate(username=username, password=password)
+            # EmailBackend looks the user up by email and checks the password in one query
+            user = authenticate(self.request, email=email, password=password)
             if user is None:
                 raise forms.ValidationError('Invalid email or password.')
-            elif not user.is_active:
-                raise forms.ValidationError('This account is disabled.')
-            
+
             cleaned_data['user'] = user
 
         return cleaned_data
@@ -106,12 +115,10 @@ class ForgotPasswordForm(forms.Form):
     )
 
     def clean_email(self):
-        email = self.cleaned_data.get('email')
-        try:
-            user = User.objects.get(email=email)
-            return email
-        except User.DoesNotExist:
+        email = self.cleaned_data.get('email').lower()
+        if not User.objects.filter(email=email).exists():
             raise forms.ValidationError('No account found with this email address.')
+        return email
 
 class VerifyTokenForm(forms.Form):
     token = forms.CharField(
@@ -136,18 +143,16 @@ class VerifyTokenForm(forms.Form):
             raise forms.ValidationError('Please enter a valid 6-digit code.')
         
         if self.user:
-            from .models import PasswordResetToken
-            try:
-                reset_token = PasswordResetToken.objects.get(
-                    user=self.user,
-                    token=token,
-                    is_used=False
-                )
-                if reset_token.is_expired():
-                    raise forms.ValidationError('This verification code has expired. Please request a new one.')
-                return token
-            except PasswordResetToken.DoesNotExist:
+            reset_token = PasswordResetToken.objects.filter(
+                user_id=self.user.pk,
+                token=token,
+                is_used=False
+            ).only('id', 'created_at').first()
+            if reset_token is None:
                 raise forms.ValidationError('Invalid verification code.')
+            if reset_token.is_expired():
+                raise forms.ValidationError('This verification code has expired. Please request a new one.')
+            return token
         
         return token
 
@@ -155,13 +160,13 @@ class ResetPasswordForm(forms.Form):
     new_password1 = forms.CharField(
         widget=forms.PasswordInput(attrs={
             'placeholder': 'Enter new password',
-            'class': 'w-full px-4 py-3 text-sm text-gray-700 bg-[#F9F9F9] border border-gray-300 rounded-lg focus:outline-none focus:border-gray-300'
+            'class': AUTH_INPUT_CLASS
         })
     )
     new_password2 = forms.CharField(
         widget=forms.PasswordInput(attrs={
             'placeholder': 'Confirm your password',
-            'class': 'w-full px-4 py-3 text-sm text-gray-700 bg-[#F9F9F9] border border-gray-300 rounded-lg focus:outline-none focus:border-gray-300'
+            'class': AUTH_INPUT_CLASS
         })
     )
 
@@ -178,18 +183,90 @@ class ResetPasswordForm(forms.Form):
         return password2
 
 
-class BookForm(forms.ModelForm):
+class CachedMainCategoryIterator(ModelChoiceIterator):
+    """Renders main category options from the cache instead of querying per form"""
+
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ("", self.field.empty_label)
+        yield from get_main_category_choices()
+
+    def __len__(self):
+        return len(get_main_category_choices()) + (self.field.empty_label is not None)
+
+    def __bool__(self):
+        return self.field.empty_label is not None or bool(get_main_category_choices())
+
+
+class MainCategoryChoiceField(forms.ModelChoiceField):
+    """
+    Main category select with cached options.
+    Submitted values are still validated against the queryset.
+    """
+    iterator = CachedMainCategoryIterator
+
+
+def _resolve_subcategory(user, main_category, subcategory_name):
+    """
+    Sub-category of main_category with this name (case-insensitive), created
+    auto-approved if missing. The (lower(name), parent) unique constraint keeps
+    concurrent submissions from creating duplicates.
+    """
+    try:
+        subcategory, _ = Category.objects.get_or_create(
+            parent=main_category,
+            name__iexact=subcategory_name,
+            defaults={
+                'name': subcategory_name,
+                'created_by': user,
+                'is_main_category': False,
+                'is_active': True,
+                'approval_status': 'approved',  # Auto-approve
+                'is_approved': True,
+            }
+        )
+    except ValidationError:
+        # Category.save() runs full_clean(), so losing the race to a concurrent
+        # submit fails constraint validation instead of raising IntegrityError
+        subcategory = Category.objects.filter(parent=main_category, name__iexact=subcategory_name).first()
+        if subcategory is None:
+            raise
+    return subcategory
+
+
+class CategorizedProductFormBase(forms.ModelForm):
+    """
+    Shared fields and behaviour of the seller product forms.
+    Subclasses declare their own image/file fields and name them, with their
+    upload limits, in the class attributes below.
+    """
+    product_label = 'product'  # Used in the title placeholder and category help text
+    description_placeholder = 'Enter details'
+    image_field_name = None
+    file_field_name = None
+    file_max_size = None
+    file_size_error = ''
+    file_extensions = frozenset()
+    file_type_error = ''
+
+    image_max_size = 10 * 1024 * 1024  # 10MB
+    image_extensions = _IMAGE_EXTS
+    upload_overhead = 1024 * 1024  # Non-file fields and multipart framing
+
+    @classmethod
+    def max_request_size(cls):
+        """Largest request body a valid submission of this form can have"""
+        return (cls.file_max_size or 0) + cls.image_max_size + cls.upload_overhead
+
     title = forms.CharField(
         max_length=255,
         widget=forms.TextInput(attrs={
-            'placeholder': 'Enter book name',
-            'class': 'w-full h-11 bg-zinc-50 rounded-md border border-gray-300 px-4 focus:outline-none focus:border-gray-300'
+            'class': PRODUCT_INPUT_CLASS
         })
     )
     description = forms.CharField(
         widget=forms.Textarea(attrs={
-            'placeholder': 'Enter details',
-            'class': 'w-full min-h-[150px] md:min-h-[200px] bg-zinc-50 rounded-md border border-gray-300 p-4 focus:outline-none focus:border-gray-300',
+            'class': PRODUCT_TEXTAREA_CLASS,
             'rows': 6
         })
     )
@@ -198,28 +275,27 @@ class BookForm(forms.ModelForm):
         decimal_places=2,
         widget=forms.NumberInput(attrs={
             'placeholder': '$$$',
-            'class': 'w-full h-11 bg-zinc-50 rounded-md border border-gray-300 px-4 focus:outline-none focus:border-gray-300',
+            'class': PRODUCT_INPUT_CLASS,
             'step': '0.01'
         })
     )
 
     # Two-tier category selection
-    main_category = forms.ModelChoiceField(
+    main_category = MainCategoryChoiceField(
         queryset=Category.objects.filter(is_main_category=True, is_active=True),
         empty_label="Select Main Category",
         widget=forms.Select(attrs={
-            'class': 'w-full h-11 bg-zinc-50 rounded-md border border-gray-300 px-4 focus:outline-none focus:border-gray-300',
+            'class': PRODUCT_INPUT_CLASS,
             'id': 'main-category-select',
             'onchange': 'loadSubcategories(this.value)'
-        }),
-        help_text="Select the main category for your book"
+        })
     )
 
     subcategory = forms.CharField(
         max_length=100,
         required=True,
         widget=forms.TextInput(attrs={
-            'class': 'w-full h-11 bg-zinc-50 rounded-md border border-gray-300 px-4 focus:outline-none focus:border-gray-300',
+            'class': PRODUCT_INPUT_CLASS,
             'id': 'subcategory-input',
             'list': 'subcategory-datalist',
             'placeholder': 'Type or select a sub-category',
@@ -228,31 +304,20 @@ class BookForm(forms.ModelForm):
         help_text="Type a new sub-category or select from existing ones"
     )
 
-    book_image = forms.ImageField(
-        required=False,
-        widget=forms.FileInput(attrs={
-            'class': 'hidden',
-            'accept': 'image/*',
-            'id': 'book-image-input'
-        })
-    )
-    book_file = forms.FileField(
-        widget=forms.FileInput(attrs={
-            'class': 'hidden',
-            'accept': '.zip,.pdf,.epub,.mobi',
-            'id': 'book-file-input'
-        })
-    )
-
-    class Meta:
-        model = Book
-        fields = ['title', 'description', 'price', 'book_image', 'book_file']
-
     def __init__(self, *args, **kwargs):
         self.user = kwargs.pop('user', None)
         super().__init__(*args, **kwargs)
 
-        # If editing existing book, pre-populate category fields
+        self.fields['title'].widget.attrs['placeholder'] = f'Enter {self.product_label} name'
+        self.fields['description'].widget.attrs['placeholder'] = self.description_placeholder
+        self.fields['main_category'].help_text = f"Select the main category for your {self.product_label}"
+
+        # Upload checks run as field validators, i.e. only on newly uploaded files
+        self.fields[self.image_field_name].validators.append(self.validate_image)
+        if self.file_field_name:
+            self.fields[self.file_field_name].validators.append(self.validate_file)
+
+        # If editing existing product, pre-populate category fields
         if self.instance and self.instance.pk and self.instance.category:
             if self.instance.category.parent:
                 # It's a sub-category
@@ -265,122 +330,84 @@ class BookForm(forms.ModelForm):
 
     def clean(self):
         cleaned_data = super().clean()
-        main_category = cleaned_data.get('main_category')
         subcategory_name = cleaned_data.get('subcategory', '').strip()
 
         if not subcategory_name:
             raise forms.ValidationError("Sub-category is required")
 
-        # Normalize subcategory name (capitalize first letter of each word)
-        subcategory_name = subcategory_name.title()
-
-        # Check if subcategory exists under this main category (case-insensitive)
-        subcategory = Category.objects.filter(
-            parent=main_category,
-            name__iexact=subcategory_name
-        ).first()
-
-        if subcategory:
-            # Use existing subcategory
-            cleaned_data['category'] = subcategory
-        else:
-            # Create new subcategory
-            subcategory = Category.objects.create(
-                name=subcategory_name,
-                parent=main_category,
-                created_by=self.user,
-                is_main_category=False,
-                is_active=True,
-                approval_status='approved',  # Auto-approve
-                is_approved=True
-            )
-            cleaned_data['category'] = subcategory
+        # Name normalized to title case; the sub-category is resolved in save()
+        cleaned_data['subcategory'] = subcategory_name.title()
 
         return cleaned_data
 
     def save(self, commit=True):
         instance = super().save(commit=False)
-        instance.category = self.cleaned_data['category']
 
-        if commit:
-            instance.save()
+        # Find or create the sub-category together with the product save
+        with transaction.atomic():
+            instance.category = _resolve_subcategory(
+                self.user, self.cleaned_data['main_category'], self.cleaned_data['subcategory']
+            )
+            if commit:
+                instance.save()
 
         return instance
 
-    def clean_book_file(self):
-        file = self.cleaned_data.get('book_file')
-        if file:
-            if file.size > 100 * 1024 * 1024:  # 100MB
-                raise forms.ValidationError('File size cannot exceed 100MB.')
+    def validate_file(self, file):
+        if file.size > self.file_max_size:
+            raise forms.ValidationError(self.file_size_error)
 
-            valid_extensions = ['.zip', '.pdf', '.epub', '.mobi']
-            file_extension = file.name.lower().split('.')[-1]
-            if f'.{file_extension}' not in valid_extensions:
-                raise forms.ValidationError('Only ZIP, PDF, EPUB, and MOBI files are allowed.')
-        return file
+        extension = file.name.rpartition('.')[2].lower()
+        if extension not in self.file_extensions:
+            raise forms.ValidationError(self.file_type_error)
+        validate_file_signature(file, extension)
 
-    def clean_book_image(self):
-        image = self.cleaned_data.get('book_image')
-        if image:
-            if image.size > 10 * 1024 * 1024:  # 10MB
-                raise forms.ValidationError('Image size cannot exceed 10MB.')
+    def validate_image(self, image):
+        if image.size > self.image_max_size:
+            raise forms.ValidationError('Image size cannot exceed 10MB.')
 
-            valid_formats = ['jpeg', 'jpg', 'png']
-            file_extension = image.name.lower().split('.')[-1]
-            if file_extension not in valid_formats:
-                raise forms.ValidationError('Only JPEG and PNG images are allowed.')
-        return image
+        if image.name.rpartition('.')[2].lower() not in self.image_extensions:
+            raise forms.ValidationError('Only JPEG and PNG images are allowed.')
 
 
-class CourseForm(forms.ModelForm):
-    title = forms.CharField(
-        max_length=255,
-        widget=forms.TextInput(attrs={
-            'placeholder': 'Enter course name',
-            'class': 'w-full h-11 bg-zinc-50 rounded-md border border-gray-300 px-4 focus:outline-none focus:border-gray-300'
-        })
-    )
-    description = forms.CharField(
-        widget=forms.Textarea(attrs={
-            'placeholder': 'Enter details',
-            'class': 'w-full min-h-[150px] md:min-h-[200px] bg-zinc-50 rounded-md border border-gray-300 p-4 focus:outline-none focus:border-gray-300',
-            'rows': 6
+class BookForm(CategorizedProductFormBase):
+    product_label = 'book'
+    image_field_name = 'book_image'
+    file_field_name = 'book_file'
+    file_max_size = 100 * 1024 * 1024  # 100MB
+    file_size_error = 'File size cannot exceed 100MB.'
+    file_extensions = _BOOK_EXTS
+    file_type_error = 'Only ZIP, PDF, EPUB, and MOBI files are allowed.'
+
+    book_image = forms.ImageField(
+        required=False,
+        widget=forms.FileInput(attrs={
+            'class': 'hidden',
+            'accept': 'image/*',
+            'id': 'book-image-input'
         })
     )
-    price = forms.DecimalField(
-        max_digits=10,
-        decimal_places=2,
-        widget=forms.NumberInput(attrs={
-            'placeholder': '$$$',
-            'class': 'w-full h-11 bg-zinc-50 rounded-md border border-gray-300 px-4 focus:outline-none focus:border-gray-300',
-            'step': '0.01'
+    book_file = forms.FileField(
+        widget=forms.FileInput(attrs={
+            'class': 'hidden',
+            'accept': '.zip,.pdf,.epub,.mobi',
+            'id': 'book-file-input'
         })
     )
 
-    # Two-tier category selection
-    main_category = forms.ModelChoiceField(
-        queryset=Category.objects.filter(is_main_category=True, is_active=True),
-        empty_label="Select Main Category",
-        widget=forms.Select(attrs={
-            'class': 'w-full h-11 bg-zinc-50 rounded-md border border-gray-300 px-4 focus:outline-none focus:border-gray-300',
-            'id': 'main-category-select',
-            'onchange': 'loadSubcategories(this.value)'
-        }),
-        help_text="Select the main category for your course"
-    )
+    class Meta:
+        model = Book
+        fields = ['title', 'description', 'price', 'book_image', 'book_file']
 
-    subcategory = forms.CharField(
-        max_length=100,
-        required=True,
-        widget=forms.TextInput(attrs={
-            'class': 'w-full h-11 bg-zinc-50 rounded-md border border-gray-300 px-4 focus:outline-none focus:border-gray-300',
-            'id': 'subcategory-input',
-            'list': 'subcategory-datalist',
-            'placeholder': 'Type or select a sub-category',
-            'autocomplete': 'off'
-        }),
-        help_text="Type a new sub-category or select from existing ones"
-    )
+
+class CourseForm(CategorizedProductFormBase):
+    product_label = 'course'
+    image_field_name = 'course_image'
+    file_field_name = 'course_file'
+    file_max_size = 500 * 1024 * 1024  # 500MB for courses (video files)
+    file_size_error = 'File size cannot exceed 500MB.'
+    file_extensions = _COURSE_EXTS
+    file_type_error = 'Only ZIP, PDF, and video files (MP4, AVI, MOV, WMV) are allowed.'
 
     course_image = forms.ImageField(
         required=False,
@@ -402,132 +429,15 @@ class CourseForm(forms.ModelForm):
         model = Course
         fields = ['title', 'description', 'price', 'course_image', 'course_file']
 
-    def __init__(self, *args, **kwargs):
-        self.user = kwargs.pop('user', None)
-        super().__init__(*args, **kwargs)
-
-        if self.instance and self.instance.pk and self.instance.category:
-            if self.instance.category.parent:
-                self.fields['main_category'].initial = self.instance.category.parent
-                self.fields['subcategory'].initial = self.instance.category.name
-            else:
-                self.fields['main_category'].initial = self.instance.category
-                self.fields['subcategory'].initial = ''
-
-    def clean(self):
-        cleaned_data = super().clean()
-        main_category = cleaned_data.get('main_category')
-        subcategory_name = cleaned_data.get('subcategory', '').strip()
-
-        if not subcategory_name:
-            raise forms.ValidationError("Sub-category is required")
-
-        subcategory_name = subcategory_name.title()
-
-        subcategory = Category.objects.filter(
-            parent=main_category,
-            name__iexact=subcategory_name
-        ).first()
-
-        if subcategory:
-            cleaned_data['category'] = subcategory
-        else:
-            subcategory = Category.objects.create(
-                name=subcategory_name,
-                parent=main_category,
-                created_by=self.user,
-                is_main_category=False,
-                is_active=True,
-                approval_status='approved',
-                is_approved=True
-            )
-            cleaned_data['category'] = subcategory
-
-        return cleaned_data
-
-    def save(self, commit=True):
-        instance = super().save(commit=False)
-        instance.category = self.cleaned_data['category']
-
-        if commit:
-            instance.save()
-
-        return instance
-
-    def clean_course_file(self):
-        file = self.cleaned_data.get('course_file')
-        if file:
-            if file.size > 500 * 1024 * 1024:  # 500MB for courses (video files)
-                raise forms.ValidationError('File size cannot exceed 500MB.')
-
-            valid_extensions = ['.zip', '.pdf', '.mp4', '.avi', '.mov', '.wmv']
-            file_extension = file.name.lower().split('.')[-1]
-            if f'.{file_extension}' not in valid_extensions:
-                raise forms.ValidationError('Only ZIP, PDF, and video files (MP4, AVI, MOV, WMV) are allowed.')
-        return file
-
-    def clean_course_image(self):
-        image = self.cleaned_data.get('course_image')
-        if image:
-            if image.size > 10 * 1024 * 1024:  # 10MB
-                raise forms.ValidationError('Image size cannot exceed 10MB.')
-
-            valid_formats = ['jpeg', 'jpg', 'png']
-            file_extension = image.name.lower().split('.')[-1]
-            if file_extension not in valid_formats:
-                raise forms.ValidationError('Only JPEG and PNG images are allowed.')
-        return image
-
-
-class WebinarForm(forms.ModelForm):
-    title = forms.CharField(
-        max_length=255,
-        widget=forms.TextInput(attrs={
-            'placeholder': 'Enter webinar name',
-            'class': 'w-full h-11 bg-zinc-50 rounded-md border border-gray-300 px-4 focus:outline-none focus:border-gray-300'
-        })
-    )
-    description = forms.CharField(
-        widget=forms.Textarea(attrs={
-            'placeholder': 'Enter details',
-            'class': 'w-full min-h-[150px] md:min-h-[200px] bg-zinc-50 rounded-md border border-gray-300 p-4 focus:outline-none focus:border-gray-300',
-            'rows': 6
-        })
-    )
-    price = forms.DecimalField(
-        max_digits=10,
-        decimal_places=2,
-        widget=forms.NumberInput(attrs={
-            'placeholder': '$$$',
-            'class': 'w-full h-11 bg-zinc-50 rounded-md border border-gray-300 px-4 focus:outline-none focus:border-gray-300',
-            'step': '0.01'
-        })
-    )
-
-    # Two-tier category selection
-    main_category = forms.ModelChoiceField(
-        queryset=Category.objects.filter(is_main_category=True, is_active=True),
-        empty_label="Select Main Category",
-        widget=forms.Select(attrs={
-            'class': 'w-full h-11 bg-zinc-50 rounded-md border border-gray-300 px-4 focus:outline-none focus:border-gray-300',
-            'id': 'main-category-select',
-            'onchange': 'loadSubcategories(this.value)'
-        }),
-        help_text="Select the main category for your webinar"
-    )
 
-    subcategory = forms.CharField(
-        max_length=100,
-        required=True,
-        widget=forms.TextInput(attrs={
-            'class': 'w-full h-11 bg-zinc-50 rounded-md border border-gray-300 px-4 focus:outline-none focus:border-gray-300',
-            'id': 'subcategory-input',
-            'list': 'subcategory-datalist',
-            'placeholder': 'Type or select a sub-category',
-            'autocomplete': 'off'
-        }),
-        help_text="Type a new sub-category or select from existing ones"
-    )
+class WebinarForm(CategorizedProductFormBase):
+    product_label = 'webinar'
+    image_field_name = 'webinar_image'
+    file_field_name = 'webinar_file'
+    file_max_size = 1000 * 1024 * 1024  # 1GB for webinars (video files)
+    file_size_error = 'File size cannot exceed 1GB.'
+    file_extensions = _WEBINAR_EXTS
+    file_type_error = 'Only ZIP and video files (MP4, AVI, MOV, WMV) are allowed.'
 
     webinar_image = forms.ImageField(
         required=False,
@@ -549,132 +459,11 @@ class WebinarForm(forms.ModelForm):
         model = Webinar
         fields = ['title', 'description', 'price', 'webinar_image', 'webinar_file']
 
-    def __init__(self, *args, **kwargs):
-        self.user = kwargs.pop('user', None)
-        super().__init__(*args, **kwargs)
 
-        if self.instance and self.instance.pk and self.instance.category:
-            if self.instance.category.parent:
-                self.fields['main_category'].initial = self.instance.category.parent
-                self.fields['subcategory'].initial = self.instance.category.name
-            else:
-                self.fields['main_category'].initial = self.instance.category
-                self.fields['subcategory'].initial = ''
-
-    def clean(self):
-        cleaned_data = super().clean()
-        main_category = cleaned_data.get('main_category')
-        subcategory_name = cleaned_data.get('subcategory', '').strip()
-
-        if not subcategory_name:
-            raise forms.ValidationError("Sub-category is required")
-
-        subcategory_name = subcategory_name.title()
-
-        subcategory = Category.objects.filter(
-            parent=main_category,
-            name__iexact=subcategory_name
-        ).first()
-
-        if subcategory:
-            cleaned_data['category'] = subcategory
-        else:
-            subcategory = Category.objects.create(
-                name=subcategory_name,
-                parent=main_category,
-                created_by=self.user,
-                is_main_category=False,
-                is_active=True,
-                approval_status='approved',
-                is_approved=True
-            )
-            cleaned_data['category'] = subcategory
-
-        return cleaned_data
-
-    def save(self, commit=True):
-        instance = super().save(commit=False)
-        instance.category = self.cleaned_data['category']
-
-        if commit:
-            instance.save()
-
-        return instance
-
-    def clean_webinar_file(self):
-        file = self.cleaned_data.get('webinar_file')
-        if file:
-            if file.size > 1000 * 1024 * 1024:  # 1GB for webinars (video files)
-                raise forms.ValidationError('File size cannot exceed 1GB.')
-
-            valid_extensions = ['.zip', '.mp4', '.avi', '.mov', '.wmv']
-            file_extension = file.name.lower().split('.')[-1]
-            if f'.{file_extension}' not in valid_extensions:
-                raise forms.ValidationError('Only ZIP and video files (MP4, AVI, MOV, WMV) are allowed.')
-        return file
-
-    def clean_webinar_image(self):
-        image = self.cleaned_data.get('webinar_image')
-        if image:
-            if image.size > 10 * 1024 * 1024:  # 10MB
-                raise forms.ValidationError('Image size cannot exceed 10MB.')
-
-            valid_formats = ['jpeg', 'jpg', 'png']
-            file_extension = image.name.lower().split('.')[-1]
-            if file_extension not in valid_formats:
-                raise forms.ValidationError('Only JPEG and PNG images are allowed.')
-        return image
-
-
-class ServiceForm(forms.ModelForm):
-    title = forms.CharField(
-        max_length=255,
-        widget=forms.TextInput(attrs={
-            'placeholder': 'Enter service name',
-            'class': 'w-full h-11 bg-zinc-50 rounded-md border border-gray-300 px-4 focus:outline-none focus:border-gray-300'
-        })
-    )
-    description = forms.CharField(
-        widget=forms.Textarea(attrs={
-            'placeholder': 'Enter service details',
-            'class': 'w-full min-h-[150px] md:min-h-[200px] bg-zinc-50 rounded-md border border-gray-300 p-4 focus:outline-none focus:border-gray-300',
-            'rows': 6
-        })
-    )
-    price = forms.DecimalField(
-        max_digits=10,
-        decimal_places=2,
-        widget=forms.NumberInput(attrs={
-            'placeholder': '$$$',
-            'class': 'w-full h-11 bg-zinc-50 rounded-md border border-gray-300 px-4 focus:outline-none focus:border-gray-300',
-            'step': '0.01'
-        })
-    )
-
-    # Two-tier category selection
-    main_category = forms.ModelChoiceField(
-        queryset=Category.objects.filter(is_main_category=True, is_active=True),
-        empty_label="Select Main Category",
-        widget=forms.Select(attrs={
-            'class': 'w-full h-11 bg-zinc-50 rounded-md border border-gray-300 px-4 focus:outline-none focus:border-gray-300',
-            'id': 'main-category-select',
-            'onchange': 'loadSubcategories(this.value)'
-        }),
-        help_text="Select the main category for your service"
-    )
-
-    subcategory = forms.CharField(
-        max_length=100,
-        required=True,
-        widget=forms.TextInput(attrs={
-            'class': 'w-full h-11 bg-zinc-50 rounded-md border border-gray-300 px-4 focus:outline-none focus:border-gray-300',
-            'id': 'subcategory-input',
-            'list': 'subcategory-datalist',
-            'placeholder': 'Type or select a sub-category',
-            'autocomplete': 'off'
-        }),
-        help_text="Type a new sub-category or select from existing ones"
-    )
+class ServiceForm(CategorizedProductFormBase):
+    product_label = 'service'
+    description_placeholder = 'Enter service details'
+    image_field_name = 'service_image'
 
     service_image = forms.ImageField(
         required=False,
@@ -688,67 +477,3 @@ class ServiceForm(forms.ModelForm):
     class Meta:
         model = Service
         fields = ['title', 'description', 'price', 'service_image']
-
-    def __init__(self, *args, **kwargs):
-        self.user = kwargs.pop('user', None)
-        super().__init__(*args, **kwargs)
-
-        if self.instance and self.instance.pk and self.instance.category:
-            if self.instance.category.parent:
-                self.fields['main_category'].initial = self.instance.category.parent
-                self.fields['subcategory'].initial = self.instance.category.name
-            else:
-                self.fields['main_category'].initial = self.instance.category
-                self.fields['subcategory'].initial = ''
-
-    def clean(self):
-        cleaned_data = super().clean()
-        main_category = cleaned_data.get('main_category')
-        subcategory_name = cleaned_data.get('subcategory', '').strip()
-
-        if not subcategory_name:
-            raise forms.ValidationError("Sub-category is required")
-
-        subcategory_name = subcategory_name.title()
-
-        subcategory = Category.objects.filter(
-            parent=main_category,
-            name__iexact=subcategory_name
-        ).first()
-
-        if subcategory:
-            cleaned_data['category'] = subcategory
-        else:
-            subcategory = Category.objects.create(
-                name=subcategory_name,
-                parent=main_category,
-                created_by=self.user,
-                is_main_category=False,
-                is_active=True,
-                approval_status='approved',
-                is_approved=True
-            )
-            cleaned_data['category'] = subcategory
-
-        return cleaned_data
-
-    def save(self, commit=True):
-        instance = super().save(commit=False)
-        instance.category = self.cleaned_data['category']
-
-        if commit:
-            instance.save()
-
-        return instance
-
-    def clean_service_image(self):
-        image = self.cleaned_data.get('service_image')
-        if image:
-            if image.size > 10 * 1024 * 1024:  # 10MB
-                raise forms.ValidationError('Image size cannot exceed 10MB.')
-
-            valid_formats = ['jpeg', 'jpg', 'png']
-            file_extension = image.name.lower().split('.')[-1]
-            if file_extension not in valid_formats:
-                raise forms.ValidationError('Only JPEG and PNG images are allowed.')
-        return image
\ No newline at end of file
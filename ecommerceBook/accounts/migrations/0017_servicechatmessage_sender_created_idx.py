@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-16 06:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0016_product_user_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='servicechatmessage',
+            index=models.Index(fields=['sender', '-created_at'], name='accounts_se_sender__d14eb5_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-16 06:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0017_servicechatmessage_sender_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(fields=['approval_status', '-created_at'], name='cat_approval_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='servicechat',
+            index=models.Index(fields=['-updated_at'], name='accounts_se_updated_3c57ed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='servicechatmessage',
+            index=models.Index(fields=['is_read', '-created_at'], name='accounts_se_is_read_9a2dc9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['-date_joined'], name='accounts_us_date_jo_bab293_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userpreference',
+            index=models.Index(fields=['-last_updated'], name='accounts_us_last_up_942efb_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-16 06:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0019_text_search_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_deleted', False)), fields=['category', '-created_at'], name='book_listed_cat_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_deleted', False)), fields=['category', '-created_at'], name='course_listed_cat_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_deleted', False)), fields=['category', '-created_at'], name='service_listed_cat_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='webinar',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_deleted', False)), fields=['category', '-created_at'], name='webinar_listed_cat_idx'),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 4.2.30 on 2026-10-16 06:31
+
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_rating_sellers(apps, schema_editor):
+    """Copy each rated product's seller onto its existing ratings"""
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    OrderItem = apps.get_model('accounts', 'OrderItem')
+    Rating = apps.get_model('accounts', 'Rating')
+
+    for model_name in ('book', 'course', 'webinar', 'service'):
+        content_type = ContentType.objects.filter(app_label='accounts', model=model_name).first()
+        if content_type is None:
+            continue
+        Product = apps.get_model('accounts', model_name)
+
+        product_by_item = dict(
+            OrderItem.objects.filter(content_type=content_type, rating__isnull=False)
+            .values_list('id', 'object_id')
+        )
+        seller_by_product = dict(
+            Product.objects.filter(pk__in=set(product_by_item.values()))
+            .values_list('pk', 'seller_id')
+        )
+
+        items_by_seller = defaultdict(list)
+        for item_id, product_id in product_by_item.items():
+            if product_id in seller_by_product:
+                items_by_seller[seller_by_product[product_id]].append(item_id)
+
+        for seller_id, item_ids in items_by_seller.items():
+            Rating.objects.filter(order_item_id__in=item_ids, seller__isnull=True).update(seller_id=seller_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0020_listed_product_category_indexes'),
+        ('contenttypes', '0002_remove_content_type_name'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rating',
+            name='seller',
+            field=models.ForeignKey(blank=True, editable=False, help_text='Seller of the rated product', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='received_ratings', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='rating',
+            index=models.Index(fields=['seller', '-created_at'], name='accounts_ra_seller__a27abf_idx'),
+        ),
+        migrations.RunPython(
+            backfill_rating_sellers,
+            reverse_code=migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 4.2.30 on 2026-10-16 06:41
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0022_notification_unread_idx'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='book',
+            options={'base_manager_name': 'objects', 'ordering': ['-created_at'], 'verbose_name': 'Book', 'verbose_name_plural': 'Books'},
+        ),
+        migrations.AlterModelOptions(
+            name='course',
+            options={'base_manager_name': 'objects', 'ordering': ['-created_at'], 'verbose_name': 'Course', 'verbose_name_plural': 'Courses'},
+        ),
+        migrations.AlterModelOptions(
+            name='service',
+            options={'base_manager_name': 'objects', 'ordering': ['-created_at'], 'verbose_name': 'Service', 'verbose_name_plural': 'Services'},
+        ),
+        migrations.AlterModelOptions(
+            name='webinar',
+            options={'base_manager_name': 'objects', 'ordering': ['-created_at'], 'verbose_name': 'Webinar', 'verbose_name_plural': 'Webinars'},
+        ),
+        migrations.AddField(
+            model_name='book',
+            name='embedding',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.FloatField(), blank=True, editable=False, null=True, size=None),
+        ),
+        migrations.AddField(
+            model_name='book',
+            name='embedding_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=32),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='embedding',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.FloatField(), blank=True, editable=False, null=True, size=None),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='embedding_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=32),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='embedding',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.FloatField(), blank=True, editable=False, null=True, size=None),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='embedding_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=32),
+        ),
+        migrations.AddField(
+            model_name='webinar',
+            name='embedding',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.FloatField(), blank=True, editable=False, null=True, size=None),
+        ),
+        migrations.AddField(
+            model_name='webinar',
+            name='embedding_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=32),
+        ),
+    ]
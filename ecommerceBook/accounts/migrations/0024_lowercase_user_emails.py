@@ -0,0 +1,38 @@
+# Generated by Django 4.2.30 on 2026-10-16 06:45
+
+from collections import defaultdict
+
+from django.db import migrations
+from django.db.models.functions import Lower
+
+
+def lowercase_emails(apps, schema_editor):
+    """
+    Lowercase stored emails so lookups can match exactly.
+    Accounts whose emails differ only by case are left untouched for a manual merge.
+    """
+    User = apps.get_model('accounts', 'User')
+
+    accounts_by_email = defaultdict(list)
+    rows = User.objects.exclude(email='').exclude(email=Lower('email')).values_list('id', 'email')
+    for user_id, email in rows:
+        accounts_by_email[email.lower()].append(user_id)
+
+    taken = set(User.objects.filter(email__in=list(accounts_by_email)).values_list('email', flat=True))
+    for email, user_ids in accounts_by_email.items():
+        if len(user_ids) == 1 and email not in taken:
+            User.objects.filter(id=user_ids[0]).update(email=email)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0023_product_embedding'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            lowercase_emails,
+            reverse_code=migrations.RunPython.noop
+        ),
+    ]
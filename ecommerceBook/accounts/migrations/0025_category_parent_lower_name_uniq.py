@@ -0,0 +1,51 @@
+# Generated by Django 4.2.30 on 2026-10-16 06:46
+
+from collections import defaultdict
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+def merge_duplicate_subcategories(apps, schema_editor):
+    """
+    Fold sub-categories that differ only by name case into the oldest one,
+    moving their products across, so the case-insensitive constraint can be added.
+    """
+    Category = apps.get_model('accounts', 'Category')
+    product_models = [apps.get_model('accounts', name) for name in ('Book', 'Course', 'Webinar', 'Service')]
+
+    groups = defaultdict(list)
+    for category_id, parent_id, name in (
+        Category.objects.filter(parent__isnull=False).order_by('id').values_list('id', 'parent_id', 'name')
+    ):
+        groups[(parent_id, name.lower())].append(category_id)
+
+    for category_ids in groups.values():
+        keep, duplicates = category_ids[0], category_ids[1:]
+        if not duplicates:
+            continue
+        for model in product_models:
+            model.objects.filter(category_id__in=duplicates).update(category_id=keep)
+        Category.objects.filter(id__in=duplicates).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0024_lowercase_user_emails'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='category',
+            unique_together=set(),
+        ),
+        migrations.RunPython(
+            merge_duplicate_subcategories,
+            reverse_code=migrations.RunPython.noop
+        ),
+        migrations.AddConstraint(
+            model_name='category',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('name'), models.F('parent'), name='category_parent_lower_name_uniq'),
+        ),
+    ]
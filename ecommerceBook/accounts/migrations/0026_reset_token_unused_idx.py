@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-16 06:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0025_category_parent_lower_name_uniq'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='passwordresettoken',
+            index=models.Index(condition=models.Q(('is_used', False)), fields=['user', 'token'], name='reset_token_unused_idx'),
+        ),
+    ]
@@ -3,11 +3,15 @@ Database models for ecommerceBook application.
 Refactored for better organization, DRY principles, and database constraints.
 """
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Lower, Upper
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.utils import timezone
+from django.utils.functional import cached_property
 from django.core.cache import cache
 from datetime import timedelta
 from decimal import Decimal
@@ -186,15 +190,31 @@ class User(AbstractUser):
         indexes = [
             models.Index(fields=['user_type', 'is_active']),
             models.Index(fields=['email']),
+            models.Index(fields=['-date_joined']),
+            # Trigram indexes back the admin's icontains searches (UPPER(col) LIKE ...)
+            GinIndex(OpClass(Upper('username'), name='gin_trgm_ops'), name='user_username_trgm_idx'),
+            GinIndex(OpClass(Upper('full_name'), name='gin_trgm_ops'), name='user_full_name_trgm_idx'),
+            GinIndex(OpClass(Upper('email'), name='gin_trgm_ops'), name='user_email_trgm_idx'),
         ]
 
     def __str__(self):
         return f"{self.username} ({self.user_type})"
 
+    def save(self, *args, **kwargs):
+        # Stored lowercase so email lookups are exact matches on the email index
+        if self.email:
+            self.email = self.email.lower()
+        super().save(*args, **kwargs)
+
     def get_full_name(self):
         """Return full name or username as fallback"""
         return self.full_name or self.username
 
+    @cached_property
+    def profile_image_url(self):
+        """Storage URL of the profile image, resolved once per instance"""
+        return self.profile_image.url if self.profile_image else ''
+
     def has_buyer_access(self):
         """Check if user has paid for buyer dashboard access"""
         return self.buyer_access_paid
@@ -256,6 +276,12 @@ class PasswordResetToken(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['user', 'is_used', 'created_at']),
+            # Code verification: point lookup on a user's live tokens
+            models.Index(
+                fields=['user', 'token'],
+                name='reset_token_unused_idx',
+                condition=models.Q(is_used=False),
+            ),
         ]
 
     def __str__(self):
@@ -300,7 +326,30 @@ class PasswordResetToken(models.Model):
 # PRODUCT MODELS
 # ==============================================================================
 
-class Category(models.Model):
+class ListCacheVersionMixin:
+    """
+    Version token for a model's cached list data (API list pages, form choices).
+    Cache keys include list_cache_token(); save()/delete() call
+    invalidate_list_cache(), which drops the token and orphans every entry at once.
+    """
+
+    @classmethod
+    def list_cache_version_key(cls):
+        """Cache key holding the current version of cached list data"""
+        return f'{cls.__name__.lower()}_list_version'
+
+    @classmethod
+    def list_cache_token(cls):
+        """Current version token, created on first use after an invalidation"""
+        return cache.get_or_set(cls.list_cache_version_key(), lambda: secrets.token_hex(4), None)
+
+    @classmethod
+    def invalidate_list_cache(cls):
+        """Orphan every cached list entry for this model"""
+        cache.delete(cls.list_cache_version_key())
+
+
+class Category(ListCacheVersionMixin, models.Model):
     """
     Hierarchical category system with two levels: Main categories (admin-only) and Sub-categories (seller-created).
     Main categories have no parent. Sub-categories must have a parent.
@@ -360,10 +409,15 @@ class Category(models.Model):
         verbose_name = "Category"
         verbose_name_plural = "Categories"
         ordering = ['parent__name', 'name']
-        unique_together = [['parent', 'name']]  # Prevent duplicate sub-categories under same parent
+        constraints = [
+            # Prevent duplicate sub-categories under same parent, whatever their case
+            models.UniqueConstraint(Lower('name'), 'parent', name='category_parent_lower_name_uniq'),
+        ]
         indexes = [
             models.Index(fields=['parent', 'is_active'], name='cat_parent_active_idx'),
             models.Index(fields=['is_main_category', 'is_active'], name='cat_main_active_idx'),
+            models.Index(fields=['approval_status', '-created_at'], name='cat_approval_created_idx'),
+            GinIndex(OpClass(Upper('description'), name='gin_trgm_ops'), name='cat_desc_trgm_idx'),
         ]
 
     def __str__(self):
@@ -410,6 +464,21 @@ class Category(models.Model):
 
         return count
 
+    @classmethod
+    def generate_unique_slug(cls, base_slug, exclude_pk=None):
+        """Return base_slug, or the first free base_slug-N, using one query"""
+        taken = set(
+            cls.objects.filter(slug__startswith=base_slug)
+            .exclude(pk=exclude_pk)
+            .values_list('slug', flat=True)
+        )
+        slug = base_slug
+        counter = 1
+        while slug in taken:
+            slug = f"{base_slug}-{counter}"
+            counter += 1
+        return slug
+
     def clean(self):
         """Validation logic"""
         from django.core.exceptions import ValidationError
@@ -431,14 +500,7 @@ class Category(models.Model):
         if not self.slug:
             from django.utils.text import slugify
             base_name = f"{self.parent.name}-{self.name}" if self.parent else self.name
-            base_slug = slugify(base_name)
-            self.slug = base_slug
-
-            # Handle duplicate slugs
-            counter = 1
-            while Category.objects.filter(slug=self.slug).exclude(pk=self.pk).exists():
-                self.slug = f"{base_slug}-{counter}"
-                counter += 1
+            self.slug = Category.generate_unique_slug(slugify(base_name), exclude_pk=self.pk)
 
         # Run validation
         self.full_clean()
@@ -450,6 +512,12 @@ class Category(models.Model):
         if self.parent:
             cache.delete(f'category_{self.parent.id}_products_count')
             cache.delete(f'category_{self.parent.id}_subcategories')
+        self.invalidate_list_cache()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        self.invalidate_list_cache()
+        return result
 
 
 class SiteSettings(models.Model):
@@ -489,17 +557,36 @@ class SiteSettings(models.Model):
     def __str__(self):
         return f"{self.platform_name} Settings"
 
+    EXISTS_CACHE_KEY = 'sitesettings_exists'
+    INSTANCE_CACHE_KEY = 'sitesettings_instance'
+
     def save(self, *args, **kwargs):
         """Ensure only one instance exists (singleton pattern)"""
         if not self.pk and SiteSettings.objects.exists():
             # If trying to create a new instance when one already exists
+            from django.core.exceptions import ValidationError
             raise ValidationError('Only one SiteSettings instance is allowed')
-        return super().save(*args, **kwargs)
+        result = super().save(*args, **kwargs)
+        cache.delete_many([self.EXISTS_CACHE_KEY, self.INSTANCE_CACHE_KEY])
+        return result
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        cache.delete_many([self.EXISTS_CACHE_KEY, self.INSTANCE_CACHE_KEY])
+        return result
+
+    @classmethod
+    def instance_exists(cls):
+        """Cached check for whether the singleton row has been created"""
+        return cache.get_or_set(cls.EXISTS_CACHE_KEY, cls.objects.exists, 300)
 
     @classmethod
     def get_settings(cls):
-        """Get or create the site settings instance"""
-        settings, created = cls.objects.get_or_create(pk=1)
+        """Get or create the site settings instance (cached until the next save)"""
+        settings = cache.get(cls.INSTANCE_CACHE_KEY)
+        if settings is None:
+            settings, created = cls.objects.get_or_create(pk=1)
+            cache.set(cls.INSTANCE_CACHE_KEY, settings, 300)
         return settings
 
     def get_commission_amount(self, total_amount):
@@ -515,7 +602,14 @@ class SiteSettings(models.Model):
         return total_amount - commission
 
 
-class BaseProduct(models.Model):
+class ProductManager(models.Manager):
+    """Leaves the stored embedding out of product queries unless asked for"""
+
+    def get_queryset(self):
+        return super().get_queryset().defer('embedding')
+
+
+class BaseProduct(ListCacheVersionMixin, models.Model):
     """
     Abstract base model for all product types (Book, Course, Webinar).
     Implements common fields and methods to follow DRY principle.
@@ -543,19 +637,54 @@ class BaseProduct(models.Model):
     is_active = models.BooleanField(default=True, db_index=True)
     is_deleted = models.BooleanField(default=False, db_index=True)  # Soft delete
     deleted_at = models.DateTimeField(null=True, blank=True)
+    # Last embedding sent to Pinecone, and a digest of the model + document it came from;
+    # reindexing skips the embeddings API while the digest still matches
+    embedding = ArrayField(models.FloatField(), null=True, blank=True, editable=False)
+    embedding_hash = models.CharField(max_length=32, blank=True, default='', editable=False)
+
+    objects = ProductManager()
 
     class Meta:
         abstract = True
         ordering = ['-created_at']
+        # Related-object and generic FK lookups defer the embedding too
+        base_manager_name = 'objects'
         indexes = [
             models.Index(fields=['is_active', 'is_deleted', '-created_at']),
             models.Index(fields=['seller', 'is_active']),
+            models.Index(fields=['seller', '-created_at']),
             models.Index(fields=['category', 'is_active']),
+            # Listed products (the API's base filter) per category, newest first
+            models.Index(
+                fields=['category', '-created_at'],
+                name='%(class)s_listed_cat_idx',
+                condition=models.Q(is_active=True, is_deleted=False),
+            ),
+            GinIndex(OpClass(Upper('title'), name='gin_trgm_ops'), name='%(class)s_title_trgm_idx'),
+            GinIndex(OpClass(Upper('description'), name='gin_trgm_ops'), name='%(class)s_desc_trgm_idx'),
         ]
 
+    # Name of the ImageField on the concrete product model
+    image_field_name = None
+
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.invalidate_list_cache()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        self.invalidate_list_cache()
+        return result
+
+    @cached_property
+    def image_url(self):
+        """Storage URL of the product image, resolved once per instance"""
+        image = getattr(self, self.image_field_name)
+        return image.url if image else ''
+
     def soft_delete(self):
         """Soft delete the product instead of hard delete"""
         self.is_deleted = True
@@ -628,6 +757,8 @@ class Book(BaseProduct):
         validators=[validate_book_file_size, validate_book_extension]
     )
 
+    image_field_name = 'book_image'
+
     class Meta(BaseProduct.Meta):
         verbose_name = "Book"
         verbose_name_plural = "Books"
@@ -651,6 +782,8 @@ class Course(BaseProduct):
         help_text="Course duration in hours"
     )
 
+    image_field_name = 'course_image'
+
     class Meta(BaseProduct.Meta):
         verbose_name = "Course"
         verbose_name_plural = "Courses"
@@ -674,6 +807,8 @@ class Webinar(BaseProduct):
         help_text="Original webinar date"
     )
 
+    image_field_name = 'webinar_image'
+
     class Meta(BaseProduct.Meta):
         verbose_name = "Webinar"
         verbose_name_plural = "Webinars"
@@ -689,6 +824,8 @@ class Service(BaseProduct):
         help_text="Optional service image"
     )
 
+    image_field_name = 'service_image'
+
     class Meta(BaseProduct.Meta):
         verbose_name = "Service"
         verbose_name_plural = "Services"
@@ -970,6 +1107,8 @@ class Notification(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['user', 'is_read', '-created_at']),
+            # Unread counts and mark-all-read only ever touch unread rows
+            models.Index(fields=['user'], name='notification_unread_idx', condition=models.Q(is_read=False)),
         ]
 
     def __str__(self):
@@ -990,6 +1129,16 @@ class Rating(models.Model):
     """Product ratings by buyers"""
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='ratings')
     order_item = models.ForeignKey(OrderItem, on_delete=models.CASCADE, related_name='rating')
+    # Denormalized from order_item.content_object.seller, which a GFK can't join through
+    seller = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name='received_ratings',
+        help_text="Seller of the rated product"
+    )
     rating = models.IntegerField(
         validators=[MinValueValidator(1), MaxValueValidator(5)],
         help_text="Rating from 1 to 5 stars"
@@ -1005,16 +1154,19 @@ class Rating(models.Model):
         unique_together = ('user', 'order_item')
         indexes = [
             models.Index(fields=['rating', '-created_at']),
+            models.Index(fields=['seller', '-created_at']),
         ]
 
     def __str__(self):
         return f"{self.user.username} - {self.rating} stars for {self.order_item.content_object.title}"
 
     def save(self, *args, **kwargs):
-        """Override save to clear product rating cache"""
+        """Override save to record the seller and clear product rating cache"""
+        product = self.order_item.content_object
+        if self.seller_id is None and product is not None:
+            self.seller_id = product.seller_id
         super().save(*args, **kwargs)
         # Clear the cached rating for the product
-        product = self.order_item.content_object
         if hasattr(product, 'clear_rating_cache'):
             product.clear_rating_cache()
 
@@ -1089,6 +1241,9 @@ class UserPreference(models.Model):
     class Meta:
         verbose_name = "User Preference"
         verbose_name_plural = "User Preferences"
+        indexes = [
+            models.Index(fields=['-last_updated']),
+        ]
 
     def __str__(self):
         return f"{self.user.username}'s preferences"
@@ -1131,6 +1286,7 @@ class ServiceChat(models.Model):
         indexes = [
             models.Index(fields=['buyer', '-updated_at']),
             models.Index(fields=['seller', '-updated_at']),
+            models.Index(fields=['-updated_at']),
         ]
 
     def __str__(self):
@@ -1168,6 +1324,9 @@ class ServiceChatMessage(models.Model):
         indexes = [
             models.Index(fields=['chat', 'created_at']),
             models.Index(fields=['chat', 'is_read']),
+            models.Index(fields=['sender', '-created_at']),
+            models.Index(fields=['is_read', '-created_at']),
+            GinIndex(OpClass(Upper('message'), name='gin_trgm_ops'), name='chatmsg_message_trgm_idx'),
         ]
 
     def __str__(self):
@@ -1252,6 +1411,7 @@ class ContactMessage(models.Model):
             models.Index(fields=['-created_at']),
             models.Index(fields=['status', '-created_at']),
             models.Index(fields=['email', '-created_at']),
+            GinIndex(OpClass(Upper('message'), name='gin_trgm_ops'), name='contact_message_trgm_idx'),
         ]
 
     def __str__(self):
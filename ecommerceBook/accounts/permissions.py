@@ -4,6 +4,23 @@ Custom DRF permissions for fine-grained access control.
 from rest_framework import permissions
 
 
+def is_seller_request(request):
+    """
+    Return whether the requesting user is an authenticated seller.
+    The result is memoized on the request so stacked permission classes
+    don't re-evaluate it.
+    """
+    cached = getattr(request, '_is_seller', None)
+    if cached is None:
+        user = request.user
+        cached = bool(
+            user.is_authenticated and
+            getattr(user, 'user_type', None) == 'seller'
+        )
+        request._is_seller = cached
+    return cached
+
+
 class IsOwnerOrReadOnly(permissions.BasePermission):
     """
     Object-level permission to only allow owners to edit objects.
@@ -35,10 +52,7 @@ class IsSellerOrReadOnly(permissions.BasePermission):
             return True
 
         # Write permissions only for authenticated sellers
-        return (
-            request.user.is_authenticated and
-            request.user.user_type == 'seller'
-        )
+        return is_seller_request(request)
 
 
 class IsBuyerUser(permissions.BasePermission):
@@ -59,10 +73,7 @@ class IsSellerUser(permissions.BasePermission):
     """
 
     def has_permission(self, request, view):
-        return (
-            request.user.is_authenticated and
-            request.user.user_type == 'seller'
-        )
+        return is_seller_request(request)
 
 
 class IsOwner(permissions.BasePermission):
@@ -2,6 +2,8 @@
 Django REST Framework serializers for all models.
 Provides JSON serialization/deserialization with validation.
 """
+from copy import deepcopy
+
 from rest_framework import serializers
 from django.contrib.auth import authenticate
 from django.contrib.auth.password_validation import validate_password
@@ -12,11 +14,31 @@ from .models import (
 )
 
 
+# Per-class cache of unbound fields built by ModelSerializer.get_fields()
+_FIELDS_CACHE = {}
+
+
+class CachedFieldsMixin:
+    """
+    Build a ModelSerializer's fields once per class.
+    get_fields() introspects the model on every instantiation although the
+    result only depends on the class; later instances get a deep copy.
+    Not for serializers whose fields vary with context.
+    """
+
+    def get_fields(self):
+        cls = type(self)
+        fields = _FIELDS_CACHE.get(cls)
+        if fields is None:
+            fields = _FIELDS_CACHE[cls] = super().get_fields()
+        return deepcopy(fields)
+
+
 # ==============================================================================
 # USER & AUTHENTICATION SERIALIZERS
 # ==============================================================================
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for User model"""
 
     class Meta:
@@ -131,7 +153,7 @@ class CategorySerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
 
 
-class BaseProductSerializer(serializers.ModelSerializer):
+class BaseProductSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Base serializer for product models"""
     average_rating = serializers.FloatField(
         source='get_average_rating',
@@ -170,7 +192,7 @@ class BookSerializer(BaseProductSerializer):
         ]
 
 
-class BookListSerializer(serializers.ModelSerializer):
+class BookListSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Lightweight serializer for book lists (no file fields)"""
     average_rating = serializers.FloatField(source='get_average_rating', read_only=True)
     category_name = serializers.CharField(source='category.name', read_only=True)
@@ -196,7 +218,7 @@ class CourseSerializer(BaseProductSerializer):
         ]
 
 
-class CourseListSerializer(serializers.ModelSerializer):
+class CourseListSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Lightweight serializer for course lists"""
     average_rating = serializers.FloatField(source='get_average_rating', read_only=True)
     category_name = serializers.CharField(source='category.name', read_only=True)
@@ -222,7 +244,7 @@ class WebinarSerializer(BaseProductSerializer):
         ]
 
 
-class WebinarListSerializer(serializers.ModelSerializer):
+class WebinarListSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Lightweight serializer for webinar lists"""
     average_rating = serializers.FloatField(source='get_average_rating', read_only=True)
     category_name = serializers.CharField(source='category.name', read_only=True)
@@ -239,7 +261,7 @@ class WebinarListSerializer(serializers.ModelSerializer):
 # CART & ORDER SERIALIZERS
 # ==============================================================================
 
-class CartItemSerializer(serializers.ModelSerializer):
+class CartItemSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for CartItem model"""
     product_title = serializers.CharField(
         source='content_object.title',
@@ -267,7 +289,7 @@ class CartItemSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'added_at']
 
 
-class CartSerializer(serializers.ModelSerializer):
+class CartSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for Cart model"""
     items = CartItemSerializer(many=True, read_only=True)
     total_price = serializers.DecimalField(
@@ -290,6 +312,63 @@ class CartSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'user', 'created_at', 'updated_at']
 
 
+# Plain-dict renderers for the hot cart/order read paths. They emit the same
+# payload as CartSerializer and OrderListSerializer without DRF's per-field
+# binding; the field instances below only format values.
+_money = serializers.DecimalField(max_digits=10, decimal_places=2)
+_timestamp = serializers.DateTimeField()
+
+
+def cart_item_to_dict(item):
+    """Render a CartItem like CartItemSerializer"""
+    product = item.content_object
+    return {
+        'id': item.id,
+        'content_type': item.content_type_id,
+        'object_id': item.object_id,
+        'product_title': product.title,
+        'product_price': _money.to_representation(product.price),
+        'quantity': item.quantity,
+        'total_price': _money.to_representation(item.get_total_price()),
+        'added_at': _timestamp.to_representation(item.added_at),
+    }
+
+
+def cart_to_dict(cart, items=None):
+    """
+    Render a Cart like CartSerializer; prefetch items__content_object first.
+    Pass items to render a known item list (e.g. [] after clearing) without
+    reading cart.items.
+    """
+    if items is None:
+        items = list(cart.items.all())
+    return {
+        'id': cart.id,
+        'user': cart.user_id,
+        'items': [cart_item_to_dict(item) for item in items],
+        'total_price': _money.to_representation(sum(item.get_total_price() for item in items)),
+        'total_items': len(items),
+        'created_at': _timestamp.to_representation(cart.created_at),
+        'updated_at': _timestamp.to_representation(cart.updated_at),
+    }
+
+
+# Columns read by order_row_to_dict(), plus the items_count annotation
+ORDER_LIST_VALUES = ('id', 'order_number', 'status', 'total_amount', 'created_at')
+
+
+def order_row_to_dict(row):
+    """Render an Order values() row like OrderListSerializer"""
+    return {
+        'id': row['id'],
+        'order_number': row['order_number'],
+        'status': row['status'],
+        'total_amount': _money.to_representation(row['total_amount']),
+        'items_count': row['items_count'],
+        'created_at': _timestamp.to_representation(row['created_at']),
+    }
+
+
 class OrderItemSerializer(serializers.ModelSerializer):
     """Serializer for OrderItem model"""
     product_title = serializers.CharField(
@@ -328,7 +407,7 @@ class OrderSerializer(serializers.ModelSerializer):
         ]
 
 
-class OrderListSerializer(serializers.ModelSerializer):
+class OrderListSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Lightweight serializer for order lists"""
     items_count = serializers.IntegerField(
         source='items.count',
@@ -169,24 +169,25 @@ def index_product_task(self, product_type, product_id):
     Index a single product in Pinecone.
 
     Args:
-        product_type: 'book', 'course', or 'webinar'
+        product_type: 'book', 'course', 'webinar', or 'service'
         product_id: Product ID
     """
     from .chatbot_helper import index_single_product
-    from .models import Book, Course, Webinar
+    from .models import Book, Course, Webinar, Service
 
     try:
         model_map = {
             'book': Book,
             'course': Course,
-            'webinar': Webinar
+            'webinar': Webinar,
+            'service': Service
         }
 
         if product_type not in model_map:
             logger.error(f"Invalid product type: {product_type}")
             return False
 
-        product = model_map[product_type].objects.get(id=product_id)
+        product = model_map[product_type].objects.select_related('category', 'seller').get(id=product_id)
         success = index_single_product(product, product_type)
 
         if success:
@@ -237,6 +238,28 @@ def delete_product_from_index_task(product_type, product_id):
         return False
 
 
+@shared_task
+def answer_chat_message_task(message_id):
+    """
+    Generate and store the chatbot answer for a queued chat message.
+
+    Args:
+        message_id: ChatMessage ID created with an empty answer
+    """
+    from .chatbot_helper import answer_question
+    from .models import ChatMessage
+
+    try:
+        message = ChatMessage.objects.get(id=message_id)
+    except ChatMessage.DoesNotExist:
+        logger.warning(f"Chat message {message_id} no longer exists")
+        return False
+
+    message.answer = answer_question(message.question)
+    message.save(update_fields=['answer'])
+    return True
+
+
 # ==============================================================================
 # MAINTENANCE TASKS
 # ==============================================================================
@@ -744,7 +767,7 @@ def sync_stripe_payments():
                 payment_type = metadata.get('payment_type')  # 'registration' or 'upgrade'
 
                 if user_email and payment_type:
-                    user = User.objects.filter(email=user_email).first()
+                    user = User.objects.filter(email=user_email.lower()).first()
 
                     if user:
                         # Update payment status based on Stripe status
@@ -1,7 +1,24 @@
-from django.test import TestCase, Client
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.forms import ValidationError
+from django.test import TestCase, TransactionTestCase, Client
 from django.urls import reverse
-from django.contrib.auth import get_user_model
-from .models import PasswordResetToken
+from django.contrib.auth import authenticate, get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count, QuerySet, prefetch_related_objects
+from rest_framework.test import APIClient
+from .factories import (
+    BookFactory, BuyerFactory, CartFactory, CategoryFactory, ChatSessionFactory,
+    OrderFactory, SellerFactory
+)
+from .forms import BookForm, ServiceForm, _resolve_subcategory
+from .models import Category, CartItem, ChatMessage, Order, OrderItem, PasswordResetToken
+from .tasks import answer_chat_message_task
+from .serializers import (
+    CartSerializer, OrderListSerializer, ORDER_LIST_VALUES,
+    cart_to_dict, order_row_to_dict
+)
 
 User = get_user_model()
 
@@ -71,3 +88,277 @@ class AccountsTestCase(TestCase):
             'password': 'wrongpass'
         })
         self.assertEqual(response.status_code, 200)  # Stay on page with error
+
+
+class EmailNormalizationTestCase(TestCase):
+    """
+    Emails are stored lowercase and matched exactly
+    """
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(
+            username='mixedcase',
+            email='Mixed.Case@Example.com',
+            password='testpass123',
+            full_name='Mixed Case'
+        )
+
+    def test_email_stored_lowercase(self):
+        """Test that saving a user lowercases the email"""
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.email, 'mixed.case@example.com')
+
+    def test_mixed_case_login(self):
+        """Test login with a differently cased email"""
+        user = authenticate(email='MIXED.case@example.COM', password='testpass123')
+        self.assertEqual(user, self.user)
+
+        response = self.client.post(reverse('login'), {
+            'email': 'MIXED.case@example.COM',
+            'password': 'testpass123'
+        })
+        self.assertEqual(response.status_code, 302)
+
+    def test_mixed_case_login_wrong_password(self):
+        """Test that a matching email still needs the right password"""
+        self.assertIsNone(authenticate(email='mixed.case@example.com', password='wrongpass'))
+
+    def test_duplicate_email_by_case_rejected(self):
+        """Test that settings refuses an email another account has in different case"""
+        other = User.objects.create_user(
+            username='other',
+            email='other@example.com',
+            password='testpass123',
+            full_name='Other User'
+        )
+        self.client.force_login(other)
+
+        response = self.client.post(reverse('settings'), {
+            'full_name': 'Other User',
+            'email': 'MIXED.CASE@example.com'
+        })
+        self.assertEqual(response.status_code, 302)
+        other.refresh_from_db()
+        self.assertEqual(other.email, 'other@example.com')
+
+
+class RendererTestCase(TestCase):
+    """
+    Plain-dict renderers match the serializers they stand in for
+    """
+
+    def setUp(self):
+        self.buyer = BuyerFactory()
+        self.books = [BookFactory(), BookFactory()]
+        self.book_type = ContentType.objects.get_for_model(self.books[0])
+
+    def test_cart_to_dict_matches_serializer(self):
+        """Test cart_to_dict against CartSerializer for a cart with items"""
+        cart = CartFactory(user=self.buyer)
+        for quantity, book in enumerate(self.books, start=1):
+            CartItem.objects.create(
+                cart=cart, content_type=self.book_type, object_id=book.id, quantity=quantity
+            )
+        prefetch_related_objects([cart], 'items__content_object')
+
+        self.assertEqual(cart_to_dict(cart), CartSerializer(cart).data)
+
+    def test_order_row_to_dict_matches_serializer(self):
+        """Test order_row_to_dict against OrderListSerializer"""
+        order = OrderFactory(user=self.buyer)
+        for book in self.books:
+            OrderItem.objects.create(
+                order=order, content_type=self.book_type, object_id=book.id, price=book.price
+            )
+        row = Order.objects.filter(id=order.id).values(*ORDER_LIST_VALUES).annotate(
+            items_count=Count('items')
+        ).get()
+
+        self.assertEqual(order_row_to_dict(row), OrderListSerializer(order).data)
+
+
+class CartApiTestCase(TestCase):
+    """
+    Cart API add-item endpoint
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.buyer = BuyerFactory()
+        self.client.force_authenticate(self.buyer)
+        self.book = BookFactory()
+        self.url = reverse('cart-add-item')
+
+    def add_item(self, quantity):
+        return self.client.post(self.url, {
+            'product_type': 'book',
+            'product_id': self.book.id,
+            'quantity': quantity
+        }, format='json')
+
+    def test_add_item(self):
+        """Test adding a book and incrementing its line"""
+        self.assertEqual(self.add_item(2).status_code, 200)
+        response = self.add_item(3)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['items'][0]['quantity'], 5)
+
+    def test_add_item_concurrent_insert_increments(self):
+        """Test that losing the insert race to a concurrent request increments that line"""
+        self.add_item(2)
+        real_update = QuerySet.update
+        calls = []
+
+        def first_update_misses(queryset, **kwargs):
+            # The line appears to be missing, as if another request inserted it just after
+            calls.append(kwargs)
+            return 0 if len(calls) == 1 else real_update(queryset, **kwargs)
+
+        with mock.patch.object(QuerySet, 'update', autospec=True, side_effect=first_update_misses):
+            response = self.add_item(3)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(CartItem.objects.get().quantity, 5)
+
+    def test_add_item_rejects_non_positive_quantity(self):
+        """Test that zero and negative quantities are rejected before writing"""
+        for quantity in (0, -1):
+            response = self.add_item(quantity)
+            self.assertEqual(response.status_code, 400)
+        self.assertFalse(CartItem.objects.exists())
+
+    def test_add_item_rejects_negative_increment(self):
+        """Test that a negative quantity cannot shrink an existing line"""
+        self.add_item(2)
+        response = self.add_item(-5)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(CartItem.objects.get().quantity, 2)
+
+
+class ChatApiTestCase(TransactionTestCase):
+    """
+    Async chat messages are queued after commit, or answered inline when the broker is down.
+    Runs with real commits so on_commit callbacks fire as they do in production.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.buyer = BuyerFactory()
+        self.client.force_authenticate(self.buyer)
+        self.session = ChatSessionFactory(user=self.buyer)
+        self.url = reverse('chat-session-send-message', args=[self.session.id])
+
+    def send_async(self):
+        return self.client.post(self.url, {'question': 'Any Django books?', 'async': True}, format='json')
+
+    @mock.patch.object(answer_chat_message_task, 'apply_async')
+    def test_async_message_queued(self, apply_async):
+        """Test that the answer task is queued and the empty message returned"""
+        response = self.send_async()
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['answer'], '')
+        message = ChatMessage.objects.get()
+        apply_async.assert_called_once_with(args=(message.id,), retry=False)
+
+    @mock.patch('accounts.chatbot_helper.answer_question', return_value='Try "Two Scoops of Django".')
+    @mock.patch.object(answer_chat_message_task, 'apply_async', side_effect=ConnectionError('broker down'))
+    def test_async_message_answered_inline_when_broker_down(self, apply_async, answer_question):
+        """Test that a queueing failure answers inline instead of leaving the message empty"""
+        response = self.send_async()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['answer'], 'Try "Two Scoops of Django".')
+        self.assertEqual(ChatMessage.objects.get().answer, 'Try "Two Scoops of Django".')
+
+
+class UploadLimitTestCase(TestCase):
+    """
+    Product uploads are capped per form before the body is read, and checked by content after
+    """
+
+    def setUp(self):
+        self.client = Client()
+        self.seller = SellerFactory(seller_access_paid=True, stripe_account_id='acct_test')
+        self.client.force_login(self.seller)
+        self.upload = {'book_file': SimpleUploadedFile('book.pdf', b'%PDF-1.4' + b'0' * 8192)}
+
+    @mock.patch.multiple(BookForm, file_max_size=1024, image_max_size=1024, upload_overhead=1024)
+    def test_oversized_body_rejected_before_reading(self):
+        """Test that a body over the book form's limits gets a 400"""
+        response = self.client.post(reverse('add_new_book'), self.upload)
+        self.assertEqual(response.status_code, 400)
+
+    @mock.patch.multiple(BookForm, file_max_size=1024, image_max_size=1024, upload_overhead=1024)
+    def test_cap_is_per_form(self):
+        """Test that the book limits don't apply to the webinar upload page"""
+        response = self.client.post(reverse('add_new_webinar'), self.upload)
+        self.assertNotEqual(response.status_code, 400)
+
+    def test_file_content_must_match_extension(self):
+        """Test that a file named .pdf must start like a PDF"""
+        form = BookForm(user=self.seller)
+        with self.assertRaises(ValidationError):
+            form.validate_file(SimpleUploadedFile('book.pdf', b'MZ not really a pdf'))
+        form.validate_file(SimpleUploadedFile('book.pdf', b'%PDF-1.4 fine'))
+
+
+class SubcategoryResolutionTestCase(TestCase):
+    """
+    Product forms create or reuse the sub-category on save, never during validation
+    """
+
+    def setUp(self):
+        self.seller = SellerFactory()
+        self.main_category = CategoryFactory(name='Design')
+
+    def service_form(self, subcategory, price='25.00'):
+        return ServiceForm(data={
+            'title': 'Logo design',
+            'description': 'Three logo concepts',
+            'price': price,
+            'main_category': self.main_category.id,
+            'subcategory': subcategory
+        }, user=self.seller)
+
+    def save_service(self, form):
+        service = form.save(commit=False)
+        service.seller = self.seller
+        service.save()
+        return service
+
+    def test_validation_creates_no_category(self):
+        """Test that validating, even successfully, writes no Category row"""
+        self.assertFalse(self.service_form('web design', price='').is_valid())
+        self.assertTrue(self.service_form('web design').is_valid())
+        self.assertFalse(Category.objects.filter(parent=self.main_category).exists())
+
+    def test_save_creates_subcategory(self):
+        """Test that save() creates the title-cased sub-category under the main category"""
+        form = self.service_form('web design')
+        self.assertTrue(form.is_valid())
+        service = self.save_service(form)
+
+        self.assertEqual(service.category.name, 'Web Design')
+        self.assertEqual(service.category.parent, self.main_category)
+
+    def test_existing_subcategory_reused(self):
+        """Test that a differently cased name reuses the existing sub-category"""
+        existing = Category.objects.create(name='Web Design', parent=self.main_category)
+        form = self.service_form('WEB design')
+        self.assertTrue(form.is_valid())
+
+        self.assertEqual(self.save_service(form).category, existing)
+        self.assertEqual(Category.objects.filter(parent=self.main_category).count(), 1)
+
+    def test_lost_create_race_returns_winner(self):
+        """Test that losing a concurrent create (ValidationError from full_clean) returns the winner"""
+        existing = Category.objects.create(name='Web Design', parent=self.main_category)
+        with mock.patch.object(
+            Category.objects, 'get_or_create',
+            side_effect=ValidationError('Category with this Name and Parent already exists.')
+        ):
+            subcategory = _resolve_subcategory(self.seller, self.main_category, 'Web Design')
+
+        self.assertEqual(subcategory, existing)
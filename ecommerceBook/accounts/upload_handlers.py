@@ -0,0 +1,52 @@
+"""
+Upload handlers that run while the request body is being read.
+"""
+from django.conf import settings
+from django.core.exceptions import RequestDataTooBig
+from django.core.files.uploadhandler import FileUploadHandler
+
+from .forms import BookForm, CourseForm, WebinarForm, ServiceForm
+
+# Product upload views (URL names) and the form whose limits bound their request size
+UPLOAD_VIEW_FORMS = {
+    'add_new_book': BookForm,
+    'edit_book': BookForm,
+    'add_new_course': CourseForm,
+    'edit_course': CourseForm,
+    'add_new_webinar': WebinarForm,
+    'edit_webinar': WebinarForm,
+    'add_new_service': ServiceForm,
+    'edit_service': ServiceForm,
+}
+
+
+def max_upload_size(request):
+    """
+    Request size cap for the view handling this request: the product form's own
+    file and image limits on upload views, MAX_UPLOAD_SIZE everywhere else.
+    """
+    match = getattr(request, 'resolver_match', None)
+    form_class = UPLOAD_VIEW_FORMS.get(match.url_name) if match else None
+    if form_class:
+        return form_class.max_request_size()
+    return getattr(settings, 'MAX_UPLOAD_SIZE', None)
+
+
+class MaxUploadSizeHandler(FileUploadHandler):
+    """
+    Refuse multipart bodies larger than the view's cap (see max_upload_size())
+    from the Content-Length header, before any file data is buffered or spooled
+    to disk (400 response, like DATA_UPLOAD_MAX_MEMORY_SIZE). Bodies within the
+    cap are read as usual; the forms then check each file's size and content.
+    """
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        max_size = max_upload_size(self.request)
+        if max_size and content_length > max_size:
+            raise RequestDataTooBig(f'Upload exceeds the {max_size} byte limit for this page.')
+
+    def receive_data_chunk(self, raw_data, start):
+        return raw_data
+
+    def file_complete(self, file_size):
+        return None
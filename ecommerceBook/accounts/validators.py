@@ -92,6 +92,48 @@ def validate_webinar_extension(file):
     validate_file_extension(file, allowed)
 
 
+# Leading bytes of each accepted upload type: (offset, magic) alternatives
+FILE_SIGNATURES = {
+    'pdf': ((0, b'%PDF-'),),
+    'zip': ((0, b'PK\x03\x04'), (0, b'PK\x05\x06')),
+    'epub': ((0, b'PK\x03\x04'),),
+    'mobi': ((60, b'BOOKMOBI'),),
+    'mp4': ((4, b'ftyp'),),
+    'mov': ((4, b'ftyp'), (4, b'moov'), (4, b'mdat'), (4, b'wide'), (4, b'free')),
+    'avi': ((8, b'AVI '),),
+    'wmv': ((0, b'\x30\x26\xb2\x75\x8e\x66\xcf\x11'),),
+}
+FILE_SIGNATURE_HEADER_SIZE = 68
+
+
+def validate_file_signature(file, extension):
+    """
+    Validate that the file content starts like its extension claims.
+    Only the first few bytes are read; extensions without a known signature pass.
+    Runs on the received file, i.e. after the upload has completed.
+
+    Args:
+        file: UploadedFile object
+        extension: Lowercase extension without the dot (e.g., 'pdf')
+
+    Raises:
+        ValidationError: If the leading bytes don't match the extension
+    """
+    signatures = FILE_SIGNATURES.get(extension)
+    if not signatures:
+        return
+
+    position = file.tell()
+    file.seek(0)
+    header = file.read(FILE_SIGNATURE_HEADER_SIZE)
+    file.seek(position)
+
+    if not any(header[offset:offset + len(magic)] == magic for offset, magic in signatures):
+        raise ValidationError(
+            _(f'File content does not match its .{extension} extension.')
+        )
+
+
 def validate_positive_price(value):
     """Validate that price is positive"""
     if value <= 0:
@@ -8,6 +8,7 @@ from django.views.decorators.csrf import csrf_exempt, ensure_csrf_cookie
 from django.views.decorators.http import require_http_methods
 from django.urls import reverse
 from django.utils import timezone
+from django.db import transaction
 from decimal import Decimal
 from .forms import UserRegistrationForm, UserLoginForm, ForgotPasswordForm, VerifyTokenForm, ResetPasswordForm, BookForm, CourseForm, WebinarForm, ServiceForm
 from .models import User, PasswordResetToken, Category, SiteSettings, Book, Course, Webinar, Service, Cart, CartItem, Order, OrderItem, ServiceChat, ServiceChatMessage, Notification
@@ -24,6 +25,46 @@ stripe.api_key = os.getenv('STRIPE_SECRET_KEY')
 logger = logging.getLogger(__name__)
 
 
+def _queue_product_index(product, product_type):
+    """
+    Index a product in Pinecone once the current transaction commits.
+    Runs on Celery so the request doesn't wait on OpenAI and Pinecone;
+    falls back to indexing inline if the broker can't be reached.
+    """
+    from .tasks import index_product_task
+
+    def enqueue():
+        try:
+            index_product_task.apply_async(args=(product_type, product.id), retry=False)
+        except Exception as e:
+            logger.warning(f"Could not queue indexing for {product_type} {product.id}, indexing inline: {e}")
+            from .chatbot_helper import index_single_product
+            try:
+                index_single_product(product, product_type)
+            except Exception as e:
+                logger.error(f"Error indexing {product_type} {product.id}: {e}")
+
+    transaction.on_commit(enqueue)
+
+
+def _queue_product_unindex(product_id, product_type):
+    """Remove a product from Pinecone after commit, on Celery when available"""
+    from .tasks import delete_product_from_index_task
+
+    def enqueue():
+        try:
+            delete_product_from_index_task.apply_async(args=(product_type, product_id), retry=False)
+        except Exception as e:
+            logger.warning(f"Could not queue index removal for {product_type} {product_id}, removing inline: {e}")
+            from .chatbot_helper import delete_product_from_index
+            try:
+                delete_product_from_index(product_id, product_type)
+            except Exception as e:
+                logger.error(f"Error deleting {product_type} {product_id} from index: {e}")
+
+    transaction.on_commit(enqueue)
+
+
 def register(request):
     if request.method == 'POST':
         form = UserRegistrationForm(request.POST)
@@ -143,15 +184,9 @@ def verify_password(request):
     if request.method == 'POST':
         form = VerifyTokenForm(request.POST, user=user)
         if form.is_valid():
+            # The form has already checked the code against the user's unused tokens
             token = form.cleaned_data['token']
-            
-            # Mark token as used
-            reset_token = PasswordResetToken.objects.get(
-                user=user, 
-                token=token, 
-                is_used=False
-            )
-            
+
             # Store token in session for final step
             request.session['reset_token'] = token
             
@@ -235,18 +270,6 @@ def buyer_dashboard(request):
         all_courses = all_courses.filter(title__icontains=search_query)
         all_webinars = all_webinars.filter(title__icontains=search_query)
 
-        # Track search query asynchronously to avoid blocking
-        results_count = all_services.count() + all_books.count() + all_courses.count() + all_webinars.count()
-
-        def async_track_search():
-            from .recommendation_engine import track_search_query
-            track_search_query(request.user, search_query, results_count)
-
-        # Run in background thread
-        thread = threading.Thread(target=async_track_search)
-        thread.daemon = True
-        thread.start()
-
     # Get cached recommendations or calculate if not cached
     cache_key = f'user_recommendations_{request.user.id}'
     recommendations = cache.get(cache_key)
@@ -276,6 +299,22 @@ def buyer_dashboard(request):
     all_courses_list = list(all_courses)
     all_webinars_list = list(all_webinars)
 
+    if search_query:
+        # Count from the evaluated lists rather than four extra COUNT queries
+        results_count = (
+            len(all_services_list) + len(all_books_list) +
+            len(all_courses_list) + len(all_webinars_list)
+        )
+
+        def async_track_search():
+            from .recommendation_engine import track_search_query
+            track_search_query(request.user, search_query, results_count)
+
+        # Track search query asynchronously to avoid blocking
+        thread = threading.Thread(target=async_track_search)
+        thread.daemon = True
+        thread.start()
+
     all_services_list.sort(key=lambda x: sort_by_recommendation(x, 'service'))
     all_books_list.sort(key=lambda x: sort_by_recommendation(x, 'book'))
     all_courses_list.sort(key=lambda x: sort_by_recommendation(x, 'course'))
@@ -536,12 +575,8 @@ def add_new_book(request):
             book.seller = request.user
             book.save()
 
-            # Index the new book in Pinecone
-            from .chatbot_helper import index_single_product
-            try:
-                index_single_product(book, 'book')
-            except Exception as e:
-                print(f"Error indexing book: {e}")
+            # Index the new book in Pinecone (queued)
+            _queue_product_index(book, 'book')
 
             # Create notification for seller
             from .models import Notification
@@ -599,12 +634,8 @@ def add_new_course(request):
             course.seller = request.user
             course.save()
 
-            # Index the new course in Pinecone
-            from .chatbot_helper import index_single_product
-            try:
-                index_single_product(course, 'course')
-            except Exception as e:
-                print(f"Error indexing course: {e}")
+            # Index the new course in Pinecone (queued)
+            _queue_product_index(course, 'course')
 
             # Create notification for seller
             from .models import Notification
@@ -662,12 +693,8 @@ def add_new_webinar(request):
             webinar.seller = request.user
             webinar.save()
 
-            # Index the new webinar in Pinecone
-            from .chatbot_helper import index_single_product
-            try:
-                index_single_product(webinar, 'webinar')
-            except Exception as e:
-                print(f"Error indexing webinar: {e}")
+            # Index the new webinar in Pinecone (queued)
+            _queue_product_index(webinar, 'webinar')
 
             # Create notification for seller
             from .models import Notification
@@ -725,12 +752,8 @@ def add_new_service(request):
             service.seller = request.user
             service.save()
 
-            # Index the new service in Pinecone
-            from .chatbot_helper import index_single_product
-            try:
-                index_single_product(service, 'service')
-            except Exception as e:
-                print(f"Error indexing service: {e}")
+            # Index the new service in Pinecone (queued)
+            _queue_product_index(service, 'service')
 
             # Create notification for seller
             from .models import Notification
@@ -770,7 +793,7 @@ def settings(request):
     if request.method == 'POST':
         # Handle settings update
         full_name = request.POST.get('full_name')
-        email = request.POST.get('email')
+        email = request.POST.get('email', '').strip().lower()
         current_password = request.POST.get('current_password')
         new_password = request.POST.get('new_password')
         confirm_password = request.POST.get('confirm_password')
@@ -800,15 +823,16 @@ def settings(request):
 
         # Handle password change
         if current_password and new_password and confirm_password:
-            if not request.user.check_password(current_password):
-                # Wrong password - silently ignore
-                return redirect('settings')
+            # Cheap checks first so malformed submits never pay for a password hash
             if new_password != confirm_password:
                 # Passwords don't match - silently ignore
                 return redirect('settings')
             if len(new_password) < 8:
                 # Password too short - silently ignore
                 return redirect('settings')
+            if not request.user.check_password(current_password):
+                # Wrong password - silently ignore
+                return redirect('settings')
 
             request.user.set_password(new_password)
 
@@ -1003,12 +1027,8 @@ def edit_book(request, book_id):
             book.seller = request.user
             book.save()
 
-            # Update the book in Pinecone index
-            from .chatbot_helper import index_single_product
-            try:
-                index_single_product(book, 'book')
-            except Exception as e:
-                print(f"Error updating book in index: {e}")
+            # Update the book in Pinecone index (queued)
+            _queue_product_index(book, 'book')
 
             # Create notification for seller
             from .models import Notification
@@ -1065,12 +1085,8 @@ def edit_course(request, course_id):
             course.seller = request.user
             course.save()
 
-            # Update the course in Pinecone index
-            from .chatbot_helper import index_single_product
-            try:
-                index_single_product(course, 'course')
-            except Exception as e:
-                print(f"Error updating course in index: {e}")
+            # Update the course in Pinecone index (queued)
+            _queue_product_index(course, 'course')
 
             # Create notification for seller
             from .models import Notification
@@ -1127,12 +1143,8 @@ def edit_webinar(request, webinar_id):
             webinar.seller = request.user
             webinar.save()
 
-            # Update the webinar in Pinecone index
-            from .chatbot_helper import index_single_product
-            try:
-                index_single_product(webinar, 'webinar')
-            except Exception as e:
-                print(f"Error updating webinar in index: {e}")
+            # Update the webinar in Pinecone index (queued)
+            _queue_product_index(webinar, 'webinar')
 
             # Create notification for seller
             from .models import Notification
@@ -1187,12 +1199,8 @@ def delete_book(request, book_id):
         book_id = book.id
         book.delete()
 
-        # Delete the book from Pinecone index
-        from .chatbot_helper import delete_product_from_index
-        try:
-            delete_product_from_index(book_id, 'book')
-        except Exception as e:
-            print(f"Error deleting book from index: {e}")
+        # Delete the book from Pinecone index (queued)
+        _queue_product_unindex(book_id, 'book')
 
         # Create notification for seller
         from .models import Notification
@@ -1233,12 +1241,8 @@ def delete_course(request, course_id):
         course_id = course.id
         course.delete()
 
-        # Delete the course from Pinecone index
-        from .chatbot_helper import delete_product_from_index
-        try:
-            delete_product_from_index(course_id, 'course')
-        except Exception as e:
-            print(f"Error deleting course from index: {e}")
+        # Delete the course from Pinecone index (queued)
+        _queue_product_unindex(course_id, 'course')
 
         # Create notification for seller
         from .models import Notification
@@ -1279,12 +1283,8 @@ def delete_webinar(request, webinar_id):
         webinar_id = webinar.id
         webinar.delete()
 
-        # Delete the webinar from Pinecone index
-        from .chatbot_helper import delete_product_from_index
-        try:
-            delete_product_from_index(webinar_id, 'webinar')
-        except Exception as e:
-            print(f"Error deleting webinar from index: {e}")
+        # Delete the webinar from Pinecone index (queued)
+        _queue_product_unindex(webinar_id, 'webinar')
 
         # Create notification for seller
         from .models import Notification
@@ -1327,12 +1327,8 @@ def edit_service(request, service_id):
             service.seller = request.user
             service.save()
 
-            # Update the service in Pinecone index
-            from .chatbot_helper import index_single_product
-            try:
-                index_single_product(service, 'service')
-            except Exception as e:
-                print(f"Error updating service in index: {e}")
+            # Update the service in Pinecone index (queued)
+            _queue_product_index(service, 'service')
 
             # Create notification for seller
             from .models import Notification
@@ -1387,12 +1383,8 @@ def delete_service(request, service_id):
         service_id = service.id
         service.delete()
 
-        # Delete the service from Pinecone index
-        from .chatbot_helper import delete_product_from_index
-        try:
-            delete_product_from_index(service_id, 'service')
-        except Exception as e:
-            print(f"Error deleting service from index: {e}")
+        # Delete the service from Pinecone index (queued)
+        _queue_product_unindex(service_id, 'service')
 
         # Create notification for seller
         from .models import Notification
@@ -2459,7 +2451,8 @@ def chatbot_message(request):
     """
     Handle chatbot messages via AJAX
     GET: Load chat history for session
-    POST: Send new message
+    POST: Send new message ({"stream": true} streams the answer as plain text,
+          with the session id in the X-Chat-Session-Id header)
     (CSRF exempt for easier debugging - should use proper CSRF in production)
     """
     # Log the request for debugging
@@ -2500,7 +2493,7 @@ def chatbot_message(request):
         import json
         import uuid
         from .models import ChatSession, ChatMessage
-        from .chatbot_helper import search_products, generate_chat_response
+        from .chatbot_helper import search_products, generate_chat_response, get_fallback_response
         from django.http import StreamingHttpResponse
 
         try:
@@ -2548,12 +2541,52 @@ def chatbot_message(request):
             # Generate AI response using OpenAI (streaming) with conversation memory
             stream = generate_chat_response(user_message, context_products, conversation_history)
 
+            if data.get('stream'):
+                # Opt-in: forward tokens to the client as OpenAI produces them
+                def stream_chunks():
+                    parts = []
+                    try:
+                        if stream is None:
+                            parts.append(get_fallback_response(user_message))
+                            yield parts[0]
+                        else:
+                            try:
+                                for chunk in stream:
+                                    content = chunk.choices[0].delta.content
+                                    if content:
+                                        parts.append(content)
+                                        yield content
+                            except Exception as e:
+                                # OpenAI or the connection failed mid-answer
+                                logger.error(f"Chatbot stream error: {e}")
+                                fallback = get_fallback_response(user_message)
+                                if parts:
+                                    fallback = "\n\n" + fallback
+                                parts.append(fallback)
+                                yield fallback
+                    finally:
+                        # Runs on errors and client disconnects too, so the exchange is kept
+                        if chat_session:
+                            ChatMessage.objects.create(
+                                session=chat_session,
+                                user=request.user,
+                                question=user_message,
+                                answer="".join(parts)
+                            )
+
+                response = StreamingHttpResponse(stream_chunks(), content_type='text/plain; charset=utf-8')
+                response['Cache-Control'] = 'no-cache'
+                response['X-Accel-Buffering'] = 'no'  # Stop nginx buffering the body
+                response['X-Chat-Session-Id'] = session_id
+                return response
+
             # Collect full response from stream
-            full_response = ""
+            parts = []
             for chunk in stream:
-                if chunk.choices[0].delta.content:
-                    content = chunk.choices[0].delta.content
-                    full_response += content
+                content = chunk.choices[0].delta.content
+                if content:
+                    parts.append(content)
+            full_response = "".join(parts)
 
             # Save complete message to database (only for authenticated users)
             if chat_session:
@@ -2932,22 +2965,33 @@ def service_chat_window(request, service_id):
     # For sellers, get all their chats for the sidebar
     seller_chats = []
     if user.user_type == 'seller':
+        from django.db.models import Count, F, OuterRef, Q, Subquery
+        # Unread count and latest message are computed per chat in the same query
+        latest = ServiceChatMessage.objects.filter(chat=OuterRef('pk')).order_by('-created_at')
         all_chats = ServiceChat.objects.filter(
             seller=user
-        ).select_related('buyer', 'service').prefetch_related('messages').order_by('-updated_at')
+        ).select_related('buyer', 'service').annotate(
+            unread_count=Count(
+                'messages',
+                filter=Q(messages__sender=F('buyer'), messages__is_read=False)
+            ),
+            last_message_text=Subquery(latest.values('message')[:1]),
+            last_message_at=Subquery(latest.values('created_at')[:1]),
+            last_message_sender_id=Subquery(latest.values('sender_id')[:1]),
+        ).order_by('-updated_at')
 
         for c in all_chats:
-            unread_count = ServiceChatMessage.objects.filter(
-                chat=c,
-                sender=c.buyer,
-                is_read=False
-            ).count()
-
-            last_message = c.messages.order_by('-created_at').first()
+            last_message = None
+            if c.last_message_at is not None:
+                last_message = {
+                    'message': c.last_message_text,
+                    'created_at': c.last_message_at,
+                    'sender_id': c.last_message_sender_id,
+                }
 
             seller_chats.append({
                 'chat': c,
-                'unread_count': unread_count,
+                'unread_count': c.unread_count,
                 'last_message': last_message,
                 'is_active': c.id == chat.id,
             })
@@ -55,6 +55,8 @@ def get_env_variable(var_name, default=None, required=False, cast=str):
 SECRET_KEY = get_env_variable('DJANGO_SECRET_KEY', required=True)
 DEBUG = get_env_variable('DJANGO_DEBUG', default='False', cast=bool)
 ALLOWED_HOSTS = get_env_variable('DJANGO_ALLOWED_HOSTS', default='localhost,127.0.0.1', cast=list)
+# Public base URL for absolute links (emails, chatbot answers), no trailing slash
+SITE_URL = get_env_variable('SITE_URL', default='http://127.0.0.1:8000').rstrip('/')
 
 # Database Settings
 DB_NAME = get_env_variable('DB_NAME', default='EcomerceDB')
@@ -76,6 +78,12 @@ CONTACT_EMAIL = get_env_variable('CONTACT_EMAIL', default='support@vortexai.com'
 # OpenAI Settings
 OPENAI_API_KEY = get_env_variable('OPENAI_API_KEY', required=True)
 
+# Embedding backend: 'openai' or 'local' (sentence-transformers model on this host).
+# Switching backends changes the vector space; point PINECONE_INDEX_NAME at a
+# new index and re-index.
+EMBEDDING_BACKEND = get_env_variable('EMBEDDING_BACKEND', default='openai')
+LOCAL_EMBEDDING_MODEL = get_env_variable('LOCAL_EMBEDDING_MODEL', default='sentence-transformers/all-MiniLM-L6-v2')
+
 # Pinecone Settings
 PINECONE_API_KEY = get_env_variable('PINECONE_API_KEY', required=True)
 PINECONE_ENVIRONMENT = get_env_variable('PINECONE_ENVIRONMENT', default='us-east-1')
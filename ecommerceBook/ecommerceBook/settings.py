@@ -115,6 +115,16 @@ DATABASES = {
 # PASSWORD VALIDATION
 # ==============================================================================
 
+# Argon2 (argon2-cffi) for new hashes; PBKDF2 hashes still verify and are
+# upgraded to Argon2 on the user's next successful login
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -175,6 +185,15 @@ else:
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
 FILE_UPLOAD_PERMISSIONS = 0o644
+# Largest request body accepted for an upload outside the product forms, which are
+# capped by their own file limits (accounts.upload_handlers.UPLOAD_VIEW_FORMS);
+# bigger bodies are refused before anything is written to disk
+MAX_UPLOAD_SIZE = 1024 * 1024 * 1024 + 10 * 1024 * 1024
+FILE_UPLOAD_HANDLERS = [
+    'accounts.upload_handlers.MaxUploadSizeHandler',
+    'django.core.files.uploadhandler.MemoryFileUploadHandler',
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
 
 # ==============================================================================
 # AUTHENTICATION & AUTHORIZATION
@@ -182,6 +201,11 @@ FILE_UPLOAD_PERMISSIONS = 0o644
 
 AUTH_USER_MODEL = 'accounts.User'
 
+# Users log in with their email; EmailBackend falls back to username for the admin
+AUTHENTICATION_BACKENDS = [
+    'accounts.backends.EmailBackend',
+]
+
 # Session configuration
 SESSION_COOKIE_AGE = 1209600  # 2 weeks
 SESSION_COOKIE_HTTPONLY = True